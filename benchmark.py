@@ -0,0 +1,214 @@
+"""
+Offline end-to-end benchmark of the pipeline on the fake Gemini backend
+Run: python benchmark.py [--articles 60] [--latency 0.5] [--error-rate 0.05]
+
+Everything runs in a temporary working directory, so the real tracker,
+caches and outputs under data/ are never touched.
+"""
+
+import argparse
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from xml.sax.saxutils import escape
+
+from config.settings import (
+    EXCEL_PATH, IMAGE_CANDIDATES, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, SUMMARY_TOKEN_BUDGETS
+)
+from content_generator.client_registry import use_backend
+from content_generator.metrics import RUN_ID, get_metrics_log
+from content_generator.resilience import RequestBudget, get_retry_policy
+from initialize_data import initialize_excel_tracker
+from llm_report import print_summary
+
+SUBJECTS = [
+    "sparse mixture-of-experts routing", "retrieval-augmented generation", "diffusion model distillation",
+    "long-context attention", "reinforcement learning from human feedback", "speculative decoding",
+    "multimodal reasoning benchmarks", "on-device language models", "protein structure prediction",
+    "agentic tool use", "quantised inference kernels", "synthetic training data"
+]
+ANGLES = [
+    "New method cuts training cost for", "Researchers release open benchmark for",
+    "Study finds hidden failure modes in", "Startup raises funding to scale", "Conference keynote recap on",
+    "Technical deep dive into", "Lab reports state-of-the-art results with"
+]
+
+VOCABULARY = (
+    "model dataset benchmark latency throughput accuracy gradient optimizer tokenizer encoder decoder "
+    "transformer attention embedding retrieval index cache memory kernel compiler quantisation pruning "
+    "distillation alignment reward policy agent planner simulator robot vision speech audio video "
+    "protein molecule chemistry climate weather finance healthcare legal education security privacy "
+    "evaluation leaderboard open weights license release paper preprint lab startup cloud chip gpu "
+    "cluster inference training pretraining finetuning adapter sparse dense mixture expert routing "
+    "context window reasoning chain verifier search graph scaling law compute budget energy efficiency"
+).split()
+
+def build_feed(count: int, seed: int) -> bytes:
+    """Synthetic RSS 2.0 document; every fifth item re-reports an earlier story"""
+    rng = random.Random(seed)
+    items, stories = [], []
+    for i in range(count):
+        if stories and i % 5 == 4:
+            title, summary = rng.choice(stories)
+            title = f"{title} (update)"
+        else:
+            subject = rng.choice(SUBJECTS)
+            title = f"{rng.choice(ANGLES)} {subject}"
+            words = rng.sample(VOCABULARY, 32)
+            # Several sentences, some ending inside quotes or brackets, to exercise truncation
+            summary = (f"<p>{subject.capitalize()}: {' '.join(words[:10])}. \"{' '.join(words[10:18]).capitalize()}.\" "
+                       f"({' '.join(words[18:25]).capitalize()}.) {' '.join(words[25:]).capitalize()}.</p>")
+            stories.append((title, summary))
+        items.append(
+            f"<item><title>{escape(title)}</title><link>https://example.com/articles/{i}</link>"
+            f"<description>{escape(summary)}</description>"
+            f"<pubDate>Mon, 06 Jan 2025 {i % 24:02d}:00:00 GMT</pubDate></item>"
+        )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>Benchmark feed</title>{"".join(items)}</channel></rss>').encode('utf-8')
+
+class StageTimer:
+    """Wall-clock time per pipeline stage"""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - started))
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.timings)
+        print(f"{'stage':<22}{'seconds':>10}{'share':>8}")
+        print("-" * 40)
+        for name, seconds in self.timings:
+            print(f"{name:<22}{seconds:>10.3f}{seconds / total:>8.0%}")
+        print("-" * 40)
+        print(f"{'total':<22}{total:>10.3f}")
+
+def check_stemmer():
+    """Inflected forms must share a stem, or BM25 and the semantic index miss them"""
+    from managers.relevance_ranker import stem
+    for forms in [("model", "models"), ("llm", "llms"), ("architecture", "architectures"),
+                  ("raise", "raises", "raised", "raising"), ("technique", "techniques"),
+                  ("train", "trained", "training"), ("technology", "technologies")]:
+        if len({stem(form) for form in forms}) != 1:
+            raise RuntimeError(f"Stems differ for {forms}: {[stem(form) for form in forms]}")
+
+def check_summaries(articles):
+    """Every prompt summary must be a prefix of the stored summary (ellipsis aside)"""
+    for article in articles:
+        for key in SUMMARY_TOKEN_BUDGETS:
+            if not article['summary'].startswith(article[key].removesuffix("…")):
+                raise RuntimeError(f"{key} is not a prefix of the summary: {article[key]!r}")
+
+def run_pipeline(args, timer: StageTimer):
+    """Every stage of main.py, fed from a synthetic feed instead of the network"""
+    # Imported here so the scheduler, caches and indexes start inside the sandbox
+    import main
+    from managers.article_store import ArticleStore
+    from managers.deduplicator import NearDuplicateCollapser
+    from managers.excel_manager import ExcelManager
+    from managers.source_validator import SourceValidator
+    from managers.topic_manager import TopicManager
+    from scrapers.feed_parser import iter_feed_entries
+    from scrapers.rss_scraper import RSSFeedScraper
+
+    with timer.stage("parse feed"):
+        scraper = RSSFeedScraper("Benchmark Feed", "https://example.com/feed.xml")
+        entries = list(iter_feed_entries(io.BytesIO(build_feed(args.articles, args.seed)), limit=args.articles))
+        articles = [scraper.parse_article(entry) for entry in entries]
+        check_summaries(articles)
+        check_stemmer()
+
+    with timer.stage("store + dedup"):
+        ArticleStore().upsert_articles(articles)
+        articles = NearDuplicateCollapser().collapse(articles)
+
+    with timer.stage("topic selection"):
+        topic, relevant = TopicManager(EXCEL_PATH).select_best_topic(articles)
+    if not topic:
+        raise RuntimeError("Topic selection returned nothing")
+
+    output_file = "outputs/ready_posts/post_benchmark.txt"
+    gemini, nano_banana = main.GeminiClient(), main.NanoBananaClient()
+    main.get_image_processor().warm_up()
+    if args.stored_image_prompt and nano_banana.prompt_store is not None:
+        nano_banana.prompt_store.put(topic, nano_banana._fallback_prompt(topic), approved=True)
+
+    with timer.stage("post (streamed)"):
+        image_prompt, image_future = main.start_image_if_prompt_known(nano_banana, topic, args.image_candidates)
+        post_content, image_prompt_future = main.stream_post_to_file(
+            gemini, nano_banana, topic, relevant, output_file, start_image_prompt=image_prompt is None
+        )
+
+    with timer.stage("sources"):
+        sources = SourceValidator().extract_sources(relevant, num_sources=4)
+
+    with timer.stage("image prompt (wait)"):
+        if image_prompt_future:
+            image_prompt = image_prompt_future.result()
+        elif not image_prompt:
+            image_prompt = main.generate_image_prompt(nano_banana, topic, post_content)
+
+    with timer.stage("image"):
+        if image_future:
+            image_data = image_future.result()
+        else:
+            image_data = main.generate_image(nano_banana, image_prompt, args.image_candidates)
+
+    with timer.stage("image renditions"):
+        image_renditions = nano_banana.save_renditions_in_background(
+            image_data, "outputs/ready_posts/post_benchmark"
+        ).result()
+        image_filepath = image_renditions.get(main.PRIMARY_RENDITION)
+
+    with timer.stage("excel + output"):
+        ExcelManager(EXCEL_PATH).add_post(topic, post_content, sources, image_filepath, image_renditions or None)
+        with open(output_file, "a", encoding='utf-8') as f:
+            main.write_post_details(f, image_filepath, image_prompt, sources, image_renditions)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline offline on the fake Gemini backend")
+    parser.add_argument("--articles", type=int, default=60, help="Items in the synthetic feed")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean fake LLM latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of LLM calls failing with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rpm", type=float, default=LLM_REQUESTS_PER_MINUTE, help="Client-side request budget")
+    parser.add_argument("--image-candidates", type=int, default=IMAGE_CANDIDATES, help="Best-of-N image generation")
+    parser.add_argument("--stored-image-prompt", action="store_true",
+                        help="Approve an image prompt for the selected topic first, so the image starts with the post")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandbox directory")
+    args = parser.parse_args()
+
+    use_backend("fake", latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    get_retry_policy().budget = RequestBudget(args.rpm, LLM_TOKENS_PER_MINUTE)
+
+    sandbox = tempfile.mkdtemp(prefix="linkedin_agent_bench_")
+    os.chdir(sandbox)
+    os.makedirs("data", exist_ok=True)
+    os.makedirs("outputs/ready_posts", exist_ok=True)
+    initialize_excel_tracker()
+
+    timer = StageTimer()
+    try:
+        run_pipeline(args, timer)
+    finally:
+        print("\n" + "="*70)
+        print(f"Benchmark: {args.articles} articles, latency {args.latency}s, error rate {args.error_rate}")
+        print("="*70)
+        timer.report()
+        print()
+        print_summary(get_metrics_log().read(RUN_ID))
+        if args.keep:
+            print(f"\nSandbox kept at {sandbox}")
+        else:
+            shutil.rmtree(sandbox, ignore_errors=True)
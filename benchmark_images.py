@@ -0,0 +1,72 @@
+"""
+Compare image encoders on output size and render time
+Run: python benchmark_images.py [--input image.png] [--repeat 5]
+
+Without --input a synthetic 1344x768 illustration-like image is used
+(the size Gemini returns for 16:9).
+"""
+
+import argparse
+import io
+import statistics
+import time
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+from config.settings import IMAGE_OUTPUT_SIZE
+from content_generator.image_processing import IMAGE_ENCODERS, render_image
+
+def synthetic_image(size=(1344, 768), seed: int = 0) -> bytes:
+    """Gradient background with soft shapes, lines and mild noise, as PNG"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :, None]
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+    colours = np.array([[10, 25, 70], [40, 90, 180], [200, 210, 230]], dtype=np.float32)
+    pixels = colours[0] * (1 - x) * (1 - y) + colours[1] * x + colours[2] * y * 0.3
+    image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x0, y0 = rng.integers(0, width), rng.integers(0, height)
+        r = int(rng.integers(10, 120))
+        fill = tuple(int(v) for v in rng.integers(60, 255, size=3))
+        draw.ellipse((x0 - r, y0 - r, x0 + r, y0 + r), outline=fill, width=3)
+    for _ in range(80):
+        points = [tuple(int(v) for v in rng.integers(0, max(size), size=2)) for _ in range(2)]
+        draw.line(points, fill=(120, 200, 255), width=1)
+    image = image.filter(ImageFilter.GaussianBlur(1.5))
+
+    noisy = np.asarray(image).astype(np.int16) + rng.integers(-6, 7, size=(height, width, 3))
+    image = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8), 'RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare image encoders on size and render time")
+    parser.add_argument("--input", help="Source image (defaults to a synthetic one)")
+    parser.add_argument("--repeat", type=int, default=5, help="Renders per encoder")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, 'rb') as f:
+            source = f.read()
+    else:
+        source = synthetic_image()
+
+    with Image.open(io.BytesIO(source)) as probe:
+        print(f"Source: {probe.format} {probe.size}, {len(source):,} bytes -> {IMAGE_OUTPUT_SIZE}\n")
+
+    print(f"{'encoder':<8}{'bytes':>12}{'vs png':>8}{'median ms':>11}{'min ms':>9}")
+    print("-" * 48)
+    png_size = None
+    for encoder in IMAGE_ENCODERS:
+        timings, output = [], b""
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            output = render_image(source, IMAGE_OUTPUT_SIZE, encoder)
+            timings.append((time.perf_counter() - started) * 1000)
+        png_size = png_size or len(output)
+        print(f"{encoder:<8}{len(output):>12,}{len(output) / png_size:>8.0%}"
+              f"{statistics.median(timings):>11.1f}{min(timings):>9.1f}")
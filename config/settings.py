@@ -51,18 +51,136 @@ MAX_POST_LENGTH = 3000
 MIN_POST_LENGTH = 250
 NUM_SOURCES = 4
 HASHTAGS = ["#AI", "#MachineLearning", "#ArtificialIntelligence", "#AIResearch", "#Innovation", "#TechBreakthrough"]
+POST_STREAMING_ENABLED = True  # Stream the post into the output file as it is generated
+IMAGE_PROMPT_CONTEXT_CHARS = 500  # Post prefix the image prompt is built from; starts it early when streaming
+
+# Image prompt store (topic -> prompt, reused on exact or near-duplicate topics)
+IMAGE_PROMPT_STORE_ENABLED = True
+IMAGE_PROMPT_STORE_PATH = "data/image_prompts.json"
+IMAGE_PROMPT_REUSE_THRESHOLD = 0.75  # Cosine of hashed topic embeddings
+IMAGE_PROMPT_APPROVED_ONLY = False  # Only reuse entries an operator marked "approved": true
+IMAGE_PROMPT_SKIP_LLM = False  # On a store miss, use the built-in template instead of asking the LLM
 
 # Excel settings
 EXCEL_PATH = "data/posts_tracker.xlsx"
-EXCEL_COLUMNS = ["date", "topic", "post_content", "sources", "posted", "posted_date", "image_path"]
+EXCEL_COLUMNS = ["date", "topic", "post_content", "sources", "posted", "posted_date", "image_path", "rendition_paths"]
+POSTED_INDEX_PATH = "data/posted_index.json"  # Inverted token index over posted topics
+
+# Semantic posted-history index (hashed embeddings, memory-mapped)
+SEMANTIC_INDEX_ENABLED = True
+SEMANTIC_INDEX_DIM = 1024
+SEMANTIC_VECTORS_PATH = "data/history_vectors.f32"
+SEMANTIC_META_PATH = "data/history_index.json"
+SEMANTIC_TOPIC_THRESHOLD = 0.6  # Cosine of article title vs posted topic
+SEMANTIC_BODY_THRESHOLD = 0.45  # Cosine of article title + summary vs post body
+
+# Summary normalization (HTML stripped once at ingest, cut at sentence boundaries)
+SUMMARY_MAX_TOKENS = 120  # Stored summary
+SUMMARY_TOKEN_BUDGETS = {
+    "summary_short": 25,   # LLM scoring prompt
+    "summary_medium": 40,  # Final topic selection prompt
+    "summary_long": 50     # Post generation prompt
+}
+
+# Article storage settings
+ARTICLE_DB_PATH = "data/articles.db"  # SQLite store of every scraped article
+EXPORT_SCRAPED_JSON = False  # Also write this run's articles to data/scraped_data.json
+
+# Near-duplicate collapsing (MinHash + LSH)
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.5  # Estimated Jaccard similarity to treat two articles as one story
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32  # 32 bands x 4 rows
+
+# Topic scoring settings
+SCORING_CHUNK_SIZE = 15  # Articles per scoring request
+SCORING_MAX_CONCURRENCY = 4  # Scoring requests in flight at once
+SCORING_MISSING_RETRIES = 1  # Follow-up requests for articles the LLM skipped
+SCORE_CACHE_ENABLED = True  # Reuse LLM scores for unchanged articles across runs
+SCORE_CACHE_PATH = "data/score_cache.db"
+SCORE_CACHE_TTL_HOURS = 48
+SCORE_CACHE_MAX_ENTRIES = 5000  # Least recently used scores are evicted beyond this
+
+# Local pre-ranking (BM25) before LLM scoring
+PRERANK_ENABLED = True
+PRERANK_TOP_K = 30  # Articles passed on to LLM scoring
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Term weights mirroring TOPIC_SELECTION_PROMPT: reward research and technical
+# innovation, penalise events, funding and marketing
+RELEVANCE_QUERY_PROFILE = {
+    "research": 2.0, "breakthrough": 2.0, "novel": 1.5, "paper": 1.5,
+    "architecture": 1.5, "technique": 1.5, "model": 1.0, "training": 1.0,
+    "inference": 1.0, "benchmark": 1.0, "reasoning": 1.0, "agent": 1.0,
+    "multimodal": 1.0, "transformer": 1.0, "llm": 1.0, "neural": 1.0,
+    "algorithm": 1.0, "dataset": 0.8, "open": 0.5, "robotics": 0.8,
+    "capability": 0.8, "discovery": 1.0, "innovation": 1.0, "efficiency": 0.8,
+    "event": -1.5, "webinar": -2.0, "conference": -1.0, "register": -1.5,
+    "funding": -1.5, "raises": -1.5, "investment": -1.0, "sponsored": -2.0,
+    "partnership": -0.8, "opinion": -1.0
+}
 
 # Scraping settings
 SCRAPE_TIMEOUT = 30
 MAX_ARTICLES_PER_SOURCE = 10
+SCRAPE_MAX_WORKERS = 8  # Hosts scraped in parallel
+FEED_CACHE_ENABLED = True  # Conditional GET with ETag / Last-Modified
+FEED_CACHE_PATH = "data/feed_cache.json"
+HOST_RATE_PER_SECOND = 0.5  # Sustained requests per second to any one host
+HOST_BURST = 2  # Requests allowed back to back before pacing kicks in
+HTTP_POOL_SIZE = 16  # Keep-alive connections kept per host
+RATE_LIMIT_COOLDOWN = 60  # Seconds to skip a host after 429/503 without Retry-After
+FEED_PARSER_MODE = "stream"  # "stream" (lxml iterparse, stops early) or "feedparser"
+SELECTOR_MEMO_PATH = "data/selector_memo.json"  # Winning CSS selector per HTML source
 
 # Gemini settings
 # Gemini settings
-GEMINI_MODEL = "gemini-2.0-flash-exp"
-GEMINI_IMAGE_MODEL = "gemini-2.5-flash-image"  # Add this
+LLM_BACKEND = "gemini"  # "gemini" or "fake" (offline, for benchmarks; see benchmark.py)
+GEMINI_MODEL = "gemini-2.0-flash-exp"  # Text model: scoring, posts, image prompts
+GEMINI_IMAGE_MODEL = "gemini-2.5-flash-image"
 GEMINI_TEMPERATURE = 0.7
+LLM_MAX_IN_FLIGHT = 4  # Concurrent async Gemini requests across the process
+LLM_HTTP_POOL_SIZE = 8  # Keep-alive connections in the shared Gemini client
+LLM_HTTP_KEEPALIVE_SECONDS = 120
+LLM_HTTP_TIMEOUT = 120  # Seconds per request (image generation is slow)
+
+# Gemini retries and client-side rate limits (shared by every call site)
+LLM_MAX_RETRIES = 4  # Retries for 408/429/5xx and network errors
+LLM_RETRY_BASE_DELAY = 1.0  # Seconds; doubles per attempt, with full jitter
+LLM_RETRY_MAX_DELAY = 30.0
+LLM_REQUESTS_PER_MINUTE = 15
+LLM_TOKENS_PER_MINUTE = 1_000_000
+LLM_OUTPUT_TOKEN_ESTIMATE = 500  # Added to the prompt estimate when reserving tokens
+
+# Generated image post-processing (runs in a worker process)
+IMAGE_OUTPUT_SIZE = (1200, 675)  # LinkedIn 16:9
+# Sizes rendered from one decode; "linkedin" is the primary image_path, others get a _<name> suffix
+IMAGE_RENDITIONS = {
+    "linkedin": IMAGE_OUTPUT_SIZE,
+    "square": (1080, 1080),
+    "portrait": (1080, 1350),
+    "thumbnail": (400, 225)
+}
+IMAGE_ENCODER = "png"  # "png", "jpeg" or "webp"; compare with benchmark_images.py
+IMAGE_JPEG_QUALITY = 90
+IMAGE_WEBP_QUALITY = 90
+IMAGE_PROCESS_WORKERS = 1
+IMAGE_CANDIDATES = 1  # Best-of-N: images generated concurrently per post, best local score kept
+IMAGE_SCORE_SIZE = 256  # Width candidates are downsampled to before scoring
+
+# Fake backend behaviour (LLM_BACKEND = "fake")
+FAKE_LLM_LATENCY = 0.5  # Mean seconds per call, varied +/-50%
+FAKE_LLM_ERROR_RATE = 0.0  # Fraction of calls failing with a retryable 503
+FAKE_LLM_SEED = 0
+
+# LLM call metrics (one JSONL record per Gemini request; summarise with llm_report.py)
+LLM_METRICS_ENABLED = True
+LLM_METRICS_PATH = "data/llm_metrics.jsonl"
+
+# Gemini response cache (opt-in; identical requests skip the network)
+LLM_CACHE_ENABLED = False
+LLM_CACHE_DIR = "data/llm_cache"
+LLM_CACHE_MAX_BYTES = 500 * 1024 * 1024
+LLM_CACHE_TEXT_TTL_HOURS = 24
+LLM_CACHE_IMAGE_TTL_HOURS = 24 * 7
 
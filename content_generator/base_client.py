@@ -0,0 +1,171 @@
+"""
+Base Gemini client - Shared request path for every Gemini call site
+"""
+
+from typing import Any, Callable, Iterator, Optional
+from config.settings import LLM_CACHE_ENABLED, LLM_OUTPUT_TOKEN_ESTIMATE
+from content_generator.client_registry import get_genai_client
+from content_generator.metrics import LLMCallRecord, track_llm_call
+from content_generator.resilience import estimate_tokens, get_retry_policy
+from content_generator.response_cache import ResponseCache, get_response_cache
+from content_generator.scheduler import get_scheduler
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class BaseGeminiClient:
+    """
+    Common plumbing for GeminiClient and NanoBananaClient
+
+    All requests go through _generate_text / _generate_bytes (or their
+    async twins) so caching, retries, rate limiting and metrics live
+    in one place. Errors are raised; call sites decide on fallbacks.
+    """
+
+    def __init__(self):
+        self.client = get_genai_client()
+        self.response_cache: Optional[ResponseCache] = get_response_cache() if LLM_CACHE_ENABLED else None
+
+    def _generate_text(self, model: str, contents: Any, config: Any = None) -> str:
+        """Text response for a request, served from cache when possible"""
+        key = self._cache_key(model, contents, config)
+        with track_llm_call(model, contents, key is not None) as call:
+            if key:
+                cached = self.response_cache.get_text(key)
+                if cached is not None:
+                    logger.info(f"Response cache hit ({model})")
+                    call.cache_hit()
+                    return cached
+
+            response = self._call(model, contents, config, call)
+            call.set_response(response)
+            text = response.text
+
+        if key and text:
+            self.response_cache.put_text(key, text)
+        return text
+
+    def _generate_bytes(self, model: str, contents: Any, config: Any,
+                        extract: Callable[[Any], Optional[bytes]]) -> Optional[bytes]:
+        """Binary (image) response for a request, cached as a blob file"""
+        key = self._cache_key(model, contents, config)
+        with track_llm_call(model, contents, key is not None) as call:
+            if key:
+                cached = self.response_cache.get_blob(key)
+                if cached is not None:
+                    logger.info(f"Response cache hit ({model}, {len(cached)} bytes)")
+                    call.cache_hit()
+                    return cached
+
+            response = self._call(model, contents, config, call)
+            call.set_response(response)
+            data = extract(response)
+
+        if key and data:
+            self.response_cache.put_blob(key, data)
+        return data
+
+    def _stream_text(self, model: str, contents: Any, config: Any = None) -> Iterator[str]:
+        """
+        Text response as chunks while the model produces them
+
+        Only opening the stream is retried; once text has been yielded a
+        failure propagates. A cache hit is yielded as a single chunk.
+        """
+        key = self._cache_key(model, contents, config)
+        pieces = []
+        with track_llm_call(model, contents, key is not None) as call:
+            if key:
+                cached = self.response_cache.get_text(key)
+                if cached is not None:
+                    logger.info(f"Response cache hit ({model})")
+                    call.cache_hit()
+                    yield cached
+                    return
+
+            def open_stream():
+                stream = iter(self.client.models.generate_content_stream(
+                    model=model, contents=contents, config=config
+                ))
+                return stream, next(stream, None)
+
+            stream, chunk = get_retry_policy().call(
+                open_stream, estimate_tokens(contents) + LLM_OUTPUT_TOKEN_ESTIMATE, on_retry=call.retried
+            )
+            call.first_chunk()
+            while chunk is not None:
+                # Usage metadata is cumulative; the last chunk has the totals
+                call.set_response(chunk)
+                if chunk.text:
+                    pieces.append(chunk.text)
+                    yield chunk.text
+                chunk = next(stream, None)
+
+        text = "".join(pieces)
+        if key and text:
+            self.response_cache.put_text(key, text)
+
+    async def _agenerate_text(self, model: str, contents: Any, config: Any = None) -> str:
+        """Async version of _generate_text"""
+        key = self._cache_key(model, contents, config)
+        with track_llm_call(model, contents, key is not None) as call:
+            if key:
+                cached = self.response_cache.get_text(key)
+                if cached is not None:
+                    logger.info(f"Response cache hit ({model})")
+                    call.cache_hit()
+                    return cached
+
+            response = await self._acall(model, contents, config, call)
+            call.set_response(response)
+            text = response.text
+
+        if key and text:
+            self.response_cache.put_text(key, text)
+        return text
+
+    async def _agenerate_bytes(self, model: str, contents: Any, config: Any,
+                               extract: Callable[[Any], Optional[bytes]]) -> Optional[bytes]:
+        """Async version of _generate_bytes"""
+        key = self._cache_key(model, contents, config)
+        with track_llm_call(model, contents, key is not None) as call:
+            if key:
+                cached = self.response_cache.get_blob(key)
+                if cached is not None:
+                    logger.info(f"Response cache hit ({model}, {len(cached)} bytes)")
+                    call.cache_hit()
+                    return cached
+
+            response = await self._acall(model, contents, config, call)
+            call.set_response(response)
+            data = extract(response)
+
+        if key and data:
+            self.response_cache.put_blob(key, data)
+        return data
+
+    def _call(self, model: str, contents: Any, config: Any = None,
+              call: Optional[LLMCallRecord] = None):
+        """Blocking SDK call with rate limiting and retries"""
+        return get_retry_policy().call(
+            lambda: self.client.models.generate_content(model=model, contents=contents, config=config),
+            estimate_tokens(contents) + LLM_OUTPUT_TOKEN_ESTIMATE,
+            on_retry=call.retried if call else None
+        )
+
+    async def _acall(self, model: str, contents: Any, config: Any = None,
+                     call: Optional[LLMCallRecord] = None):
+        """Async SDK call, routed through the shared scheduler, with rate limiting and retries"""
+        scheduler = get_scheduler()
+        return await get_retry_policy().acall(
+            lambda: scheduler.run_async(
+                lambda: self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+            ),
+            estimate_tokens(contents) + LLM_OUTPUT_TOKEN_ESTIMATE,
+            on_retry=call.retried if call else None
+        )
+
+    def _cache_key(self, model: str, contents: Any, config: Any) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(model, contents, config)
@@ -0,0 +1,83 @@
+"""
+Client Registry - One genai.Client and HTTP connection pool per process
+
+The backend is anything exposing genai.Client's .models and .aio.models:
+"gemini" is the real service, "fake" the offline FakeGenaiClient.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+import httpx
+from google import genai
+from google.genai import types
+from config.settings import (
+    LLM_BACKEND, LLM_HTTP_POOL_SIZE, LLM_HTTP_KEEPALIVE_SECONDS, LLM_HTTP_TIMEOUT,
+    FAKE_LLM_LATENCY, FAKE_LLM_ERROR_RATE, FAKE_LLM_SEED
+)
+from content_generator.fake_backend import FakeGenaiClient
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+def _build_client(api_key: str) -> genai.Client:
+    """genai.Client on pooled keep-alive sync and async transports"""
+    limits = httpx.Limits(
+        max_connections=LLM_HTTP_POOL_SIZE,
+        max_keepalive_connections=LLM_HTTP_POOL_SIZE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_SECONDS
+    )
+    timeout = httpx.Timeout(LLM_HTTP_TIMEOUT)
+    http_options = types.HttpOptions(
+        timeout=int(LLM_HTTP_TIMEOUT * 1000),
+        httpx_client=httpx.Client(limits=limits, timeout=timeout),
+        # Only ever used from the request scheduler's loop
+        httpx_async_client=httpx.AsyncClient(limits=limits, timeout=timeout)
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+_shared_clients: Dict[str, Any] = {}
+_shared_lock = threading.Lock()
+_backend = LLM_BACKEND
+_fake_options = {"latency": FAKE_LLM_LATENCY, "error_rate": FAKE_LLM_ERROR_RATE, "seed": FAKE_LLM_SEED}
+
+def use_backend(name: str, **fake_options):
+    """
+    Switch the backend for clients created from now on
+
+    Args:
+        name: "gemini" or "fake"
+        fake_options: latency, error_rate and seed for the fake backend
+    """
+    global _backend
+    if name not in ("gemini", "fake"):
+        raise ValueError(f"Unknown LLM backend: {name}")
+    with _shared_lock:
+        _backend = name
+        _fake_options.update(fake_options)
+        _shared_clients.pop("fake", None)
+
+def get_genai_client(api_key: Optional[str] = None) -> Any:
+    """
+    Return the process-wide genai.Client for an API key
+
+    Every Gemini wrapper shares it, so TLS sessions and keep-alive
+    connections are reused across scoring, post and image calls.
+    With the fake backend no API key is needed.
+    """
+    if _backend == "fake":
+        with _shared_lock:
+            if "fake" not in _shared_clients:
+                _shared_clients["fake"] = FakeGenaiClient(**_fake_options)
+                logger.info(f"Using fake Gemini backend ({_fake_options})")
+            return _shared_clients["fake"]
+
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key or api_key == "your_gemini_api_key_here":
+        raise ValueError("Please set GEMINI_API_KEY in .env file")
+
+    with _shared_lock:
+        if api_key not in _shared_clients:
+            _shared_clients[api_key] = _build_client(api_key)
+            logger.info(f"Shared Gemini client created (pool of {LLM_HTTP_POOL_SIZE} connections)")
+        return _shared_clients[api_key]
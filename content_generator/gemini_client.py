@@ -2,22 +2,20 @@
 Gemini API Client for content generation
 """
 
-import os
-from google import genai
+from typing import Iterator
+from config.settings import GEMINI_MODEL
+from content_generator.base_client import BaseGeminiClient
 from utils.logger import setup_logger
+from utils.text_normalizer import prompt_summary
 
 logger = setup_logger()
 
-class GeminiClient:
+class GeminiClient(BaseGeminiClient):
     """Wrapper for Gemini API interactions"""
     
     def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            raise ValueError("Please set GEMINI_API_KEY in .env file")
-        
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.0-flash-exp"
+        super().__init__()
+        self.model = GEMINI_MODEL
         logger.info("Gemini client initialized")
     
     def generate_content(self, prompt: str) -> str:
@@ -31,11 +29,15 @@ class GeminiClient:
             Generated text content
         """
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
-            return response.text
+            return self._generate_text(self.model, prompt)
+        except Exception as e:
+            logger.error(f"Error generating content: {e}")
+            return ""
+    
+    async def agenerate_content(self, prompt: str) -> str:
+        """Async version of generate_content; the request runs through the shared scheduler"""
+        try:
+            return await self._agenerate_text(self.model, prompt)
         except Exception as e:
             logger.error(f"Error generating content: {e}")
             return ""
@@ -52,17 +54,39 @@ class GeminiClient:
         Returns:
             Generated LinkedIn post content
         """
+        return self.generate_content(self._build_post_prompt(topic, articles, template))
+    
+    async def agenerate_post(self, topic: str, articles: list, template: str) -> str:
+        """Async version of generate_post"""
+        return await self.agenerate_content(self._build_post_prompt(topic, articles, template))
+    
+    def stream_post(self, topic: str, articles: list, template: str) -> Iterator[str]:
+        """
+        Generate LinkedIn post using Gemini, yielding text as it streams in
+        
+        Args:
+            topic: Selected topic
+            articles: List of relevant articles
+            template: Prompt template
+            
+        Yields:
+            Chunks of post content
+            
+        Raises on failure, so a cut-off stream is never taken for a full post
+        """
+        yield from self._stream_text(self.model, self._build_post_prompt(topic, articles, template))
+    
+    def _build_post_prompt(self, topic: str, articles: list, template: str) -> str:
+        """Fill the post template with the topic and article summaries"""
         # Format articles for context
         article_summaries = "\n".join([
-            f"- {art.get('title', '')}: {art.get('summary', '')[:200]}"
+            f"- {art.get('title', '')}: {prompt_summary(art, 'summary_long')}"
             for art in articles[:5]
         ])
         
         # Create prompt
-        prompt = template.format(
+        return template.format(
             topic=topic,
             article_summaries=article_summaries,
             hashtags=" ".join(["#AI", "#MachineLearning", "#TechNews"])
         )
-        
-        return self.generate_content(prompt)
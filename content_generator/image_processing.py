@@ -0,0 +1,311 @@
+"""
+Image processing - Resize and encode generated images in a worker process
+"""
+
+import binascii
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+from PIL import Image
+from config.settings import (
+    IMAGE_ENCODER, IMAGE_OUTPUT_SIZE, IMAGE_RENDITIONS, IMAGE_JPEG_QUALITY, IMAGE_WEBP_QUALITY,
+    IMAGE_PROCESS_WORKERS
+)
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# name -> (Pillow format, file extension, save options)
+IMAGE_ENCODERS: Dict[str, Tuple[str, str, Dict]] = {
+    "png": ("PNG", ".png", {"optimize": True, "compress_level": 6}),
+    "jpeg": ("JPEG", ".jpg", {"quality": IMAGE_JPEG_QUALITY, "optimize": True, "progressive": True, "subsampling": 0}),
+    "webp": ("WEBP", ".webp", {"quality": IMAGE_WEBP_QUALITY, "method": 4})
+}
+
+PRIMARY_RENDITION = "linkedin"  # Written to the plain image path
+
+BASE64_CHUNK_CHARS = 1 << 20  # Multiple of 4
+_BASE64_WHITESPACE = b" \t\r\n"
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    Read-only seekable file over a memoryview, so Pillow can decode
+    image bytes in place instead of from a BytesIO copy
+    """
+
+    def __init__(self, data: BytesLike):
+        self._view = memoryview(data).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        start, self._position = self._position, max(self._position, end)
+        return self._view[start:end].tobytes()
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), len(self._view) - self._position)
+        if count <= 0:
+            return 0
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+def decode_base64(text: Union[str, BytesLike]) -> bytearray:
+    """
+    Decode base64 into one preallocated buffer, a chunk at a time
+
+    Chunks are sliced straight from the input, so peak memory is the
+    output plus one chunk rather than several full copies of a
+    multi-megabyte image.
+    """
+    if isinstance(text, str):
+        if any(chr(c) in text for c in _BASE64_WHITESPACE):
+            text = "".join(text.split())
+        encoded = text
+    else:
+        raw = text if isinstance(text, (bytes, bytearray)) else bytes(text)
+        if any(bytes((c,)) in raw for c in _BASE64_WHITESPACE):
+            raw = raw.translate(None, _BASE64_WHITESPACE)
+        encoded = memoryview(raw)
+
+    tail = encoded[-2:]
+    padding = (tail.count("=") if isinstance(tail, str) else bytes(tail).count(b"="))
+    output = bytearray(len(encoded) // 4 * 3 - padding)
+
+    position = 0
+    for start in range(0, len(encoded), BASE64_CHUNK_CHARS):
+        decoded = binascii.a2b_base64(encoded[start:start + BASE64_CHUNK_CHARS])
+        output[position:position + len(decoded)] = decoded
+        position += len(decoded)
+    if position != len(output):
+        raise ValueError("Malformed base64 image data")
+    return output
+
+def encoder_extension(encoder: str = IMAGE_ENCODER) -> str:
+    """File extension written by an encoder"""
+    return IMAGE_ENCODERS[encoder][1]
+
+def render_image(image_data: BytesLike, size: Tuple[int, int] = IMAGE_OUTPUT_SIZE,
+                 encoder: str = IMAGE_ENCODER) -> bytes:
+    """Decode, downscale to `size` and re-encode a single rendition"""
+    return render_renditions(image_data, {"image": size}, encoder)["image"]
+
+def render_renditions(image_data: BytesLike, renditions: Dict[str, Tuple[int, int]],
+                      encoder: str = IMAGE_ENCODER) -> Dict[str, bytes]:
+    """
+    Decode once and produce every rendition from a shared resize pyramid
+
+    Each rendition is centre-cropped to its aspect ratio, taken from the
+    smallest pyramid level still at least its size and finished with a
+    LANCZOS pass of under 2x. Renditions are resized and encoded in
+    parallel threads; Pillow releases the GIL for both.
+    """
+    largest = max(renditions.values(), key=lambda size: size[0] * size[1])
+    with MemoryViewReader(image_data) as reader:
+        image = Image.open(reader)
+        if image.format == "JPEG":
+            image.draft("RGB", largest)
+        image.load()
+    image = _normalize_mode(image, IMAGE_ENCODERS[encoder][0])
+    pyramid = _build_pyramid(image, min(size[0] for size in renditions.values()),
+                             min(size[1] for size in renditions.values()))
+
+    def render(size: Tuple[int, int]) -> bytes:
+        return _encode(_fit(pyramid, size), encoder)
+
+    if len(renditions) == 1:
+        return {name: render(size) for name, size in renditions.items()}
+    with ThreadPoolExecutor(max_workers=min(len(renditions), os.cpu_count() or 1)) as executor:
+        futures = {name: executor.submit(render, size) for name, size in renditions.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def rendition_paths(base_path: str, renditions: Dict[str, Tuple[int, int]] = IMAGE_RENDITIONS,
+                    encoder: str = IMAGE_ENCODER) -> Dict[str, str]:
+    """
+    Output file per rendition
+
+    The primary rendition keeps the plain base name; others get a
+    _<name> suffix.
+    """
+    extension = encoder_extension(encoder)
+    return {
+        name: f"{base_path}{extension}" if name == PRIMARY_RENDITION else f"{base_path}_{name}{extension}"
+        for name in renditions
+    }
+
+def render_renditions_to_files(image_data: BytesLike, paths: Dict[str, str],
+                               renditions: Dict[str, Tuple[int, int]],
+                               encoder: str = IMAGE_ENCODER) -> Dict[str, int]:
+    """Render and write each rendition atomically, returning file sizes"""
+    sizes = {}
+    for name, encoded in render_renditions(image_data, renditions, encoder).items():
+        tmp_path = f"{paths[name]}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, paths[name])
+        sizes[name] = len(encoded)
+    return sizes
+
+def render_shared_renditions(segment_name: str, length: int, paths: Dict[str, str],
+                             renditions: Dict[str, Tuple[int, int]], encoder: str = IMAGE_ENCODER) -> Dict[str, int]:
+    """Worker entry point: render straight from the parent's shared memory segment"""
+    segment = shared_memory.SharedMemory(name=segment_name)
+    try:
+        with segment.buf[:length] as view:
+            return render_renditions_to_files(view, paths, renditions, encoder)
+    finally:
+        segment.close()
+
+def _normalize_mode(image: Image.Image, pil_format: str) -> Image.Image:
+    allowed_modes = ("RGB", "L") if pil_format == "JPEG" else ("RGB", "RGBA", "L")
+    if image.mode in allowed_modes:
+        return image
+    return image.convert("RGBA" if "A" in image.mode and pil_format != "JPEG" else "RGB")
+
+def _build_pyramid(image: Image.Image, min_width: int, min_height: int) -> List[Image.Image]:
+    """Source plus successive 2x reductions while still covering the smallest rendition"""
+    pyramid = [image]
+    while pyramid[-1].width >= 2 * min_width and pyramid[-1].height >= 2 * min_height:
+        pyramid.append(pyramid[-1].reduce(2))
+    return pyramid
+
+def _fit(pyramid: List[Image.Image], size: Tuple[int, int]) -> Image.Image:
+    """Centre crop to the target aspect ratio from the cheapest adequate level, then resize"""
+    source = pyramid[0]
+    target_ratio = size[0] / size[1]
+    crop_width = min(source.width, round(source.height * target_ratio))
+    crop_height = min(source.height, round(source.width / target_ratio))
+
+    level, scale = source, 1
+    for candidate in pyramid[1:]:
+        candidate_scale = source.width / candidate.width
+        if crop_width / candidate_scale < size[0] or crop_height / candidate_scale < size[1]:
+            break
+        level, scale = candidate, candidate_scale
+
+    left = (source.width - crop_width) / 2 / scale
+    top = (source.height - crop_height) / 2 / scale
+    box = (left, top, left + crop_width / scale, top + crop_height / scale)
+    if level.size == size and box == (0, 0, level.width, level.height):
+        return level
+    return level.resize(size, Image.Resampling.LANCZOS, box=box)
+
+def _encode(image: Image.Image, encoder: str) -> bytes:
+    pil_format, _, options = IMAGE_ENCODERS[encoder]
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+class ImageProcessor:
+    """
+    Process pool for CPU-bound image work, started on first use
+
+    Workers are spawned rather than forked, since the parent already runs
+    scheduler and HTTP threads whose locks a fork would copy mid-use.
+    """
+
+    def __init__(self, max_workers: int = IMAGE_PROCESS_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, image_data: BytesLike, paths: Dict[str, str],
+               renditions: Dict[str, Tuple[int, int]] = IMAGE_RENDITIONS,
+               encoder: str = IMAGE_ENCODER) -> Future:
+        """
+        Render and save renditions in a worker process; the Future holds their file sizes
+
+        The bytes are copied once into a shared memory segment that the
+        worker decodes in place, instead of being pickled through a pipe.
+        """
+        pool = self._ensure_pool()
+        if pool is None:
+            future = Future()
+            try:
+                future.set_result(render_renditions_to_files(image_data, paths, renditions, encoder))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        length = len(image_data)
+        segment = shared_memory.SharedMemory(create=True, size=max(1, length))
+
+        def release(_=None):
+            segment.close()
+            segment.unlink()
+
+        try:
+            segment.buf[:length] = image_data
+            future = pool.submit(render_shared_renditions, segment.name, length, paths, renditions, encoder)
+        except Exception:
+            # e.g. BrokenProcessPool after a worker crash; don't leave the segment in /dev/shm
+            release()
+            raise
+
+        future.add_done_callback(release)
+        return future
+
+    def warm_up(self):
+        """Start the workers ahead of time so spawn cost overlaps other work"""
+        pool = self._ensure_pool()
+        if pool is not None:
+            pool.submit(encoder_extension)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _ensure_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Current pool, replacing one broken by a crashed worker"""
+        with self._lock:
+            if self._pool is not None and getattr(self._pool, "_broken", False):
+                logger.warning("Image process pool is broken, starting a new one")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._pool is None:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Image process pool unavailable, rendering in-process: {e}")
+                    return None
+            return self._pool
+
+_shared_processor: Optional[ImageProcessor] = None
+_shared_lock = threading.Lock()
+
+def get_image_processor() -> ImageProcessor:
+    """Return the process-wide image processor"""
+    global _shared_processor
+    with _shared_lock:
+        if _shared_processor is None:
+            _shared_processor = ImageProcessor()
+        return _shared_processor
@@ -0,0 +1,106 @@
+"""
+Image Prompt Store - Persisted topic -> image prompt map with near-duplicate lookup
+"""
+
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from config.settings import (
+    IMAGE_PROMPT_STORE_PATH, IMAGE_PROMPT_REUSE_THRESHOLD, IMAGE_PROMPT_APPROVED_ONLY
+)
+from managers.semantic_index import embed
+from utils.helpers import load_json, save_json_atomic
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_topic(topic: str) -> str:
+    """Exact-match key for a topic: lowercase, whitespace collapsed"""
+    return _WHITESPACE_PATTERN.sub(" ", (topic or "").lower()).strip()
+
+class ImagePromptStore:
+    """
+    Image prompts kept per topic in a small JSON file
+
+    A topic matches a stored one exactly (after normalize_topic) or when
+    the cosine of their hashed embeddings reaches IMAGE_PROMPT_REUSE_THRESHOLD.
+    Entries marked "approved" (by an operator, in the JSON file) win
+    over generated ones and are never overwritten by them.
+    """
+
+    def __init__(self, path: str = IMAGE_PROMPT_STORE_PATH, threshold: float = IMAGE_PROMPT_REUSE_THRESHOLD,
+                 approved_only: bool = IMAGE_PROMPT_APPROVED_ONLY):
+        self.path = path
+        self.threshold = threshold
+        self.approved_only = approved_only
+        self._lock = threading.Lock()
+        self.entries: List[Dict] = load_json(path).get("prompts", [])
+        self._vectors = embed([entry["topic"] for entry in self.entries])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, topic: str) -> Optional[Dict]:
+        """Stored entry for an exact or near-duplicate topic, or None"""
+        key = normalize_topic(topic)
+        with self._lock:
+            candidates = [
+                i for i, entry in enumerate(self.entries)
+                if entry.get("approved") or not self.approved_only
+            ]
+            if not candidates:
+                return None
+
+            exact = [i for i in candidates if normalize_topic(self.entries[i]["topic"]) == key]
+            if exact:
+                return self._best(exact)
+
+            similarity = self._vectors[candidates] @ embed([topic])[0]
+            close = [i for i, score in zip(candidates, similarity) if score >= self.threshold]
+            if not close:
+                return None
+            best = self._best(close, dict(zip(candidates, similarity)))
+            logger.info(f"Image prompt store: '{topic[:60]}' matches stored topic '{best['topic'][:60]}'")
+            return best
+
+    def put(self, topic: str, prompt: str, approved: bool = False):
+        """Store a prompt for a topic, replacing the previous one unless that was approved"""
+        key = normalize_topic(topic)
+        entry = {
+            "topic": topic,
+            "prompt": prompt,
+            "approved": approved,
+            "created_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            for i, existing in enumerate(self.entries):
+                if normalize_topic(existing["topic"]) == key:
+                    if existing.get("approved") and not approved:
+                        return
+                    self.entries[i] = entry
+                    break
+            else:
+                self.entries.append(entry)
+                self._vectors = np.vstack([self._vectors, embed([topic])])
+            save_json_atomic({"prompts": self.entries}, self.path)
+
+    def _best(self, indexes: List[int], similarity: Optional[Dict[int, float]] = None) -> Dict:
+        """Approved first, then the most similar, then the newest"""
+        return self.entries[max(indexes, key=lambda i: (
+            bool(self.entries[i].get("approved")), (similarity or {}).get(i, 1.0), i
+        ))]
+
+_shared_store: Optional[ImagePromptStore] = None
+_shared_lock = threading.Lock()
+
+def get_image_prompt_store() -> ImagePromptStore:
+    """Return the process-wide image prompt store"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ImagePromptStore()
+        return _shared_store
@@ -0,0 +1,83 @@
+"""
+Image scoring - Cheap local quality checks for picking the best generated image
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from config.settings import IMAGE_SCORE_SIZE
+from content_generator.image_processing import BytesLike, MemoryViewReader
+
+WHITE_LEVEL = 235  # Channel value above which a pixel counts as white
+BORDER_FRACTION = 0.05  # Width of the edge band checked for frames, per side
+FLAT_BORDER_STD = 6.0  # Edge bands flatter than this (0-255 scale) look like a frame
+
+def image_metrics(image_data: BytesLike, sample_width: int = IMAGE_SCORE_SIZE) -> Dict[str, float]:
+    """
+    Quality metrics on a downsampled copy of an image
+
+    Returns:
+        border_white: share of near-white pixels in the edge band
+        border_flat: 1.0 if any edge band is a flat colour (a frame), else 0.0
+        white: share of near-white pixels overall
+        contrast: RMS contrast of luminance, 0-1
+        entropy: luminance histogram entropy, normalised to 0-1
+    """
+    with MemoryViewReader(image_data) as reader:
+        image = Image.open(reader)
+        image.draft("RGB", (sample_width, sample_width))
+        image.load()
+    factor = max(1, image.width // sample_width)
+    if factor > 1:
+        image = image.reduce(factor)
+    pixels = np.asarray(image.convert("RGB"), dtype=np.float32)
+
+    height, width = pixels.shape[:2]
+    band_h = max(1, int(height * BORDER_FRACTION))
+    band_w = max(1, int(width * BORDER_FRACTION))
+    bands = [pixels[:band_h], pixels[-band_h:], pixels[:, :band_w], pixels[:, -band_w:]]
+
+    white = (pixels > WHITE_LEVEL).all(axis=-1)
+    border_white = np.concatenate([
+        white[:band_h].ravel(), white[-band_h:].ravel(), white[:, :band_w].ravel(), white[:, -band_w:].ravel()
+    ]).mean()
+    border_flat = float(any(band.reshape(-1, 3).std(axis=0).max() < FLAT_BORDER_STD for band in bands))
+
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    histogram = np.bincount(luminance.astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    probabilities = histogram[histogram > 0] / histogram.sum()
+
+    return {
+        "border_white": float(border_white),
+        "border_flat": border_flat,
+        "white": float(white.mean()),
+        "contrast": float(luminance.std() / 255.0),
+        "entropy": float(-(probabilities * np.log2(probabilities)).sum() / 8.0)
+    }
+
+def quality_score(metrics: Dict[str, float]) -> float:
+    """Single score from image_metrics; higher is better"""
+    return (
+        0.5 * metrics["entropy"]
+        + 0.5 * min(1.0, metrics["contrast"] / 0.25)
+        - 1.0 * metrics["border_white"]
+        - 0.5 * metrics["border_flat"]
+        - 0.5 * metrics["white"]
+    )
+
+def pick_best_image(candidates: List[Optional[BytesLike]]) -> Tuple[Optional[int], List[Optional[float]]]:
+    """
+    Index of the highest scoring candidate and every candidate's score
+
+    Missing or undecodable candidates score None and are never picked.
+    """
+    scores: List[Optional[float]] = []
+    for data in candidates:
+        try:
+            scores.append(quality_score(image_metrics(data)) if data else None)
+        except Exception:
+            scores.append(None)
+    valid = [i for i, score in enumerate(scores) if score is not None]
+    if not valid:
+        return None, scores
+    return max(valid, key=lambda i: scores[i]), scores
@@ -0,0 +1,169 @@
+"""
+LLM Metrics - Per-call token, latency, retry and cache records in a JSONL file
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config.settings import LLM_METRICS_ENABLED, LLM_METRICS_PATH
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+RUN_ID = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("llm_stage", default="unstaged")
+
+@contextmanager
+def llm_stage(name: str):
+    """Tag every LLM call made inside the block with a pipeline stage"""
+    token = _current_stage.set(name)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+def prompt_chars(contents: Any) -> int:
+    """Characters of prompt text in a request"""
+    if isinstance(contents, str):
+        return len(contents)
+    if isinstance(contents, (list, tuple)):
+        return sum(prompt_chars(item) for item in contents)
+    parts = getattr(contents, 'parts', None)
+    if parts:
+        return sum(len(getattr(part, 'text', '') or '') for part in parts)
+    return len(str(contents))
+
+class LLMCallRecord:
+    """Measurements for one Gemini request, filled in as the call proceeds"""
+
+    def __init__(self, model: str, contents: Any, cache_enabled: bool):
+        self.data: Dict[str, Any] = {
+            "run_id": RUN_ID,
+            "stage": _current_stage.get(),
+            "model": model,
+            "prompt_chars": prompt_chars(contents),
+            "prompt_tokens": None,
+            "output_tokens": None,
+            "retries": 0,
+            "first_chunk_ms": None,
+            "cache": "miss" if cache_enabled else "off",
+            "ok": True
+        }
+        self._started = time.perf_counter()
+
+    def cache_hit(self):
+        self.data["cache"] = "hit"
+
+    def first_chunk(self):
+        """Mark time to first streamed chunk"""
+        if self.data["first_chunk_ms"] is None:
+            self.data["first_chunk_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+
+    def retried(self, attempt: int, error: Exception):
+        self.data["retries"] = attempt
+
+    def set_response(self, response: Any):
+        """Copy token counts from the SDK's usage metadata"""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            self.data["prompt_tokens"] = getattr(usage, 'prompt_token_count', None)
+            self.data["output_tokens"] = getattr(usage, 'candidates_token_count', None)
+
+    def finish(self, error: Optional[BaseException] = None) -> Dict[str, Any]:
+        self.data["latency_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+        self.data["timestamp"] = datetime.now().isoformat()
+        if error is not None:
+            self.data["ok"] = False
+            self.data["error"] = f"{type(error).__name__}: {error}"[:300]
+        return self.data
+
+class MetricsLog:
+    """Append-only JSONL file of LLM call records"""
+
+    def __init__(self, path: str = LLM_METRICS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            line = json.dumps(record, ensure_ascii=False)
+            with self._lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+        except Exception as e:
+            logger.error(f"Error writing LLM metrics: {e}")
+
+    def read(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All records, optionally limited to one run"""
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if run_id is None or record.get("run_id") == run_id:
+                        records.append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+@contextmanager
+def track_llm_call(model: str, contents: Any, cache_enabled: bool):
+    """Time one Gemini request and log its record, failed or not"""
+    call = LLMCallRecord(model, contents, cache_enabled)
+    try:
+        yield call
+    except BaseException as e:
+        _write(call.finish(e))
+        raise
+    _write(call.finish())
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate call records per pipeline stage"""
+    grouped = defaultdict(list)
+    for record in records:
+        grouped[record.get("stage", "unstaged")].append(record)
+
+    summary = {}
+    for stage, rows in grouped.items():
+        latencies = sorted(r.get("latency_ms", 0.0) for r in rows)
+        summary[stage] = {
+            "calls": len(rows),
+            "errors": sum(1 for r in rows if not r.get("ok", True)),
+            "cache_hits": sum(1 for r in rows if r.get("cache") == "hit"),
+            "retries": sum(r.get("retries", 0) for r in rows),
+            "prompt_chars": sum(r.get("prompt_chars", 0) for r in rows),
+            "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in rows),
+            "output_tokens": sum(r.get("output_tokens") or 0 for r in rows),
+            "latency_ms_total": round(sum(latencies), 1),
+            "latency_ms_avg": round(sum(latencies) / len(latencies), 1),
+            "latency_ms_p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        }
+    return summary
+
+_shared_log: Optional[MetricsLog] = None
+_shared_lock = threading.Lock()
+
+def get_metrics_log() -> MetricsLog:
+    """Return the process-wide metrics log"""
+    global _shared_log
+    with _shared_lock:
+        if _shared_log is None:
+            _shared_log = MetricsLog()
+        return _shared_log
+
+def _write(record: Dict[str, Any]):
+    if LLM_METRICS_ENABLED:
+        get_metrics_log().write(record)
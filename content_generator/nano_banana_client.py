@@ -3,40 +3,113 @@ Nano Banana (Gemini 2.5 Flash Image) Client - FIXED INDENTATION
 """
 
 import os
-import base64
-import io
-from PIL import Image
-from google import genai
+import asyncio
+import binascii
+from concurrent.futures import Future
 from google.genai import types
+from typing import Dict, List, Optional, Tuple
+from config.settings import (
+    GEMINI_MODEL, GEMINI_IMAGE_MODEL, IMAGE_PROMPT_CONTEXT_CHARS, IMAGE_ENCODER, IMAGE_OUTPUT_SIZE,
+    IMAGE_RENDITIONS, IMAGE_CANDIDATES, IMAGE_PROMPT_STORE_ENABLED, IMAGE_PROMPT_SKIP_LLM
+)
+from content_generator.base_client import BaseGeminiClient
+from content_generator.image_processing import (
+    PRIMARY_RENDITION, decode_base64, encoder_extension, get_image_processor, rendition_paths
+)
+from content_generator.image_prompt_store import ImagePromptStore, get_image_prompt_store
+from content_generator.image_scoring import pick_best_image
+from content_generator.scheduler import get_scheduler
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
-class NanoBananaClient:
+class NanoBananaClient(BaseGeminiClient):
     """Wrapper for Nano Banana (Gemini 2.5 Flash Image) API"""
     
     def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            raise ValueError("Please set GEMINI_API_KEY in .env file")
-        
-        self.client = genai.Client(api_key=api_key)
-        self.image_model = "gemini-2.5-flash-image"
-        self.text_model = "gemini-2.0-flash-exp"
+        super().__init__()
+        self.image_model = GEMINI_IMAGE_MODEL
+        self.text_model = GEMINI_MODEL
+        self.image_extension = encoder_extension()
+        self.prompt_store: Optional[ImagePromptStore] = get_image_prompt_store() if IMAGE_PROMPT_STORE_ENABLED else None
         logger.info("Nano Banana client initialized")
     
     def generate_image_prompt(self, topic: str, post_content: str) -> str:
-        """Use Gemini 2.0 to generate optimized image prompt"""
+        """Use Gemini 2.0 to generate optimized image prompt, unless one is already known for the topic"""
+        known = self.known_image_prompt(topic)
+        if known:
+            return known
+        
+        try:
+            text = self._generate_text(
+                self.text_model,
+                self._build_image_prompt_request(topic, post_content)
+            )
+            
+            return self._remember_prompt(topic, self._enhance_image_prompt(text))
+            
+        except Exception as e:
+            logger.error(f"Error generating image prompt: {e}")
+            return self._fallback_prompt(topic)
+    
+    async def agenerate_image_prompt(self, topic: str, post_content: str) -> str:
+        """Async version of generate_image_prompt; the request runs through the shared scheduler"""
+        known = self.known_image_prompt(topic)
+        if known:
+            return known
+        
         try:
-            # Fixed the long prompt string formatting
-            prompt = f"""You are an expert at creating LinkedIn-optimized image generation prompts for AI and technology content that drives professional engagement.
+            text = await self._agenerate_text(
+                self.text_model,
+                self._build_image_prompt_request(topic, post_content)
+            )
+            
+            return self._remember_prompt(topic, self._enhance_image_prompt(text))
+            
+        except Exception as e:
+            logger.error(f"Error generating image prompt: {e}")
+            return self._fallback_prompt(topic)
+    
+    def known_image_prompt(self, topic: str) -> Optional[str]:
+        """
+        Image prompt available without an LLM call, or None
+        
+        A stored prompt for the same or a near-duplicate topic wins; with
+        IMAGE_PROMPT_SKIP_LLM a miss falls back to the built-in template.
+        Needs only the topic, so callers can start the image before the post.
+        """
+        if self.prompt_store is not None:
+            entry = self.prompt_store.lookup(topic)
+            if entry:
+                approved = " (approved)" if entry.get("approved") else ""
+                logger.info(f"✓ Reusing stored image prompt{approved}: {entry['prompt'][:150]}...")
+                return entry["prompt"]
+        
+        if IMAGE_PROMPT_SKIP_LLM:
+            logger.info("No stored image prompt, using the template (IMAGE_PROMPT_SKIP_LLM)")
+            return self._fallback_prompt(topic)
+        return None
+    
+    def _remember_prompt(self, topic: str, image_prompt: str) -> str:
+        """Add a generated prompt to the store; a failed write only costs the reuse"""
+        if self.prompt_store is not None:
+            try:
+                self.prompt_store.put(topic, image_prompt)
+            except Exception as e:
+                logger.warning(f"Could not store image prompt: {e}")
+        return image_prompt
+    
+    def _build_image_prompt_request(self, topic: str, post_content: str) -> str:
+        """Instruction block asking the text model for an image prompt"""
+        # Fixed the long prompt string formatting
+        return f"""You are an expert at creating LinkedIn-optimized image generation prompts for AI and technology content that drives professional engagement.
 
 Given this LinkedIn post topic and content, create a detailed, specific image generation prompt that will produce a compelling, business-professional visual that enhances understanding of the concept.
 
 Topic: {topic}
 
 Post Content:
-{post_content[:500]}
+{post_content[:IMAGE_PROMPT_CONTEXT_CHARS]}
 
 Create an image prompt with these STRATEGIC requirements:
 
@@ -79,23 +152,16 @@ TECHNICAL SPECIFICATIONS:
 Create an image that a business executive would proudly share, that visually explains {topic} through sophisticated conceptual illustration while maintaining LinkedIn's professional standards.
 
 Return ONLY the optimized image generation prompt."""
-
-            response = self.client.models.generate_content(
-                model=self.text_model,
-                contents=prompt
-            )
-            
-            image_prompt = response.text.strip()
-            
-            # Post-process to ensure key requirements
-            enhanced_prompt = f"{image_prompt} | Full-bleed edge-to-edge composition, no borders, no white background, immersive cinematic quality, professional LinkedIn banner style."
-            
-            logger.info(f"Generated image prompt: {enhanced_prompt[:150]}...")
-            return enhanced_prompt
-            
-        except Exception as e:
-            logger.error(f"Error generating image prompt: {e}")
-            return self._fallback_prompt(topic)
+    
+    def _enhance_image_prompt(self, text: str) -> str:
+        """Post-process the model's image prompt to ensure key requirements"""
+        image_prompt = text.strip()
+        
+        # Post-process to ensure key requirements
+        enhanced_prompt = f"{image_prompt} | Full-bleed edge-to-edge composition, no borders, no white background, immersive cinematic quality, professional LinkedIn banner style."
+        
+        logger.info(f"Generated image prompt: {enhanced_prompt[:150]}...")
+        return enhanced_prompt
     
     def _fallback_prompt(self, topic: str) -> str:
         """Fallback image prompt with full-frame specification"""
@@ -107,113 +173,170 @@ Ultra-sharp detail, octane render quality.
 Professional tech illustration suitable for LinkedIn banner.
 NO text, NO people, NO frames, immersive full-bleed composition."""
     
-    def generate_linkedin_image(self, image_prompt: str) -> bytes:
-        """Generate image with correct aspect ratio config"""
+    def generate_linkedin_image(self, image_prompt: str, candidates: int = IMAGE_CANDIDATES) -> bytes:
+        """Generate image with correct aspect ratio config; best of `candidates` when above 1"""
         try:
-            logger.info("Generating 16:9 image with Nano Banana...")
+            if candidates > 1:
+                return self._pick_best_candidate([
+                    future.result() for future in self._submit_candidates(image_prompt, candidates)
+                ])
             
-            # Create content with text prompt
-            text_part = types.Part.from_text(text=image_prompt)
-            contents = [types.Content(role="user", parts=[text_part])]
+            logger.info("Generating 16:9 image with Nano Banana...")
             
-            # Create config with image_config containing aspect_ratio
-            config = types.GenerateContentConfig(
-                temperature=1.0,
-                top_p=0.95,
-                max_output_tokens=8192,
-                response_modalities=["IMAGE"],
-                image_config=types.ImageConfig(
-                    aspect_ratio="16:9"
-                ),
-                safety_settings=[
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HATE_SPEECH", 
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_DANGEROUS_CONTENT", 
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_SEXUALLY_EXPLICIT", 
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HARASSMENT", 
-                        threshold="BLOCK_NONE"
-                    ),
-                ]
-            )
+            contents, config = self._build_image_request(image_prompt)
             
             # Generate image with correct config format
-            response = self.client.models.generate_content(
-                model=self.image_model,
-                contents=contents,
-                config=config
-            )
-            
-            if not response:
-                logger.error("No response from Gemini image generation")
-                return None
+            return self._generate_bytes(self.image_model, contents, config, self._image_from_response)
             
-            # Extract image data from response
-            image_data = self._extract_image_data(response)
+        except Exception as e:
+            logger.error(f"Error generating image: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+    
+    async def agenerate_linkedin_image(self, image_prompt: str, candidates: int = IMAGE_CANDIDATES) -> bytes:
+        """Async version of generate_linkedin_image; requests run through the shared scheduler"""
+        try:
+            if candidates > 1:
+                futures = self._submit_candidates(image_prompt, candidates)
+                return self._pick_best_candidate(list(await asyncio.gather(*map(asyncio.wrap_future, futures))))
             
-            if not image_data:
-                logger.error("Could not extract image data from response")
-                return None
+            logger.info("Generating 16:9 image with Nano Banana...")
             
-            # Process and return image data
-            return self._process_image_data(image_data)
+            contents, config = self._build_image_request(image_prompt)
+            return await self._agenerate_bytes(self.image_model, contents, config, self._image_from_response)
             
         except Exception as e:
             logger.error(f"Error generating image: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
             return None
     
+    def _submit_candidates(self, image_prompt: str, candidates: int) -> List[Future]:
+        """
+        Start `candidates` image requests on the shared scheduler
+        
+        Each request carries its own seed, so candidates differ and are
+        cached separately. They share the global rate limit and retry
+        policy with every other call; a failed candidate resolves to None.
+        """
+        logger.info(f"Generating {candidates} 16:9 image candidates with Nano Banana...")
+        contents, config = self._build_image_request(image_prompt)
+        
+        async def generate(seed: int) -> Optional[bytes]:
+            try:
+                return await self._agenerate_bytes(
+                    self.image_model, contents, config.model_copy(update={"seed": seed}), self._image_from_response
+                )
+            except Exception as e:
+                logger.warning(f"Image candidate {seed + 1} failed: {e}")
+                return None
+        
+        # Unguarded: each candidate's SDK call takes its own scheduler slot
+        scheduler = get_scheduler()
+        return [scheduler.submit(lambda seed=seed: generate(seed), guarded=False) for seed in range(candidates)]
+    
+    def _pick_best_candidate(self, images: List[Optional[bytes]]) -> Optional[bytes]:
+        """Keep the highest scoring candidate; the rest are dropped"""
+        best, scores = pick_best_image(images)
+        logger.info("Image candidate scores: " + ", ".join(
+            "failed" if score is None else f"{score:.3f}" for score in scores
+        ))
+        if best is None:
+            logger.error("No usable image candidates")
+            return None
+        logger.info(f"✓ Selected image candidate {best + 1} of {len(images)}")
+        return images[best]
+    
+    def _build_image_request(self, image_prompt: str):
+        """Contents and 16:9 image config for an image generation call"""
+        # Create content with text prompt
+        text_part = types.Part.from_text(text=image_prompt)
+        contents = [types.Content(role="user", parts=[text_part])]
+        
+        # Create config with image_config containing aspect_ratio
+        config = types.GenerateContentConfig(
+            temperature=1.0,
+            top_p=0.95,
+            max_output_tokens=8192,
+            response_modalities=["IMAGE"],
+            image_config=types.ImageConfig(
+                aspect_ratio="16:9"
+            ),
+            safety_settings=[
+                types.SafetySetting(
+                    category="HARM_CATEGORY_HATE_SPEECH", 
+                    threshold="BLOCK_NONE"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_DANGEROUS_CONTENT", 
+                    threshold="BLOCK_NONE"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_SEXUALLY_EXPLICIT", 
+                    threshold="BLOCK_NONE"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_HARASSMENT", 
+                    threshold="BLOCK_NONE"
+                ),
+            ]
+        )
+        
+        return contents, config
+    
+    def _image_from_response(self, response) -> bytes:
+        """Pull the image bytes out of a generation response"""
+        if not response:
+            logger.error("No response from Gemini image generation")
+            return None
+        
+        # Extract image data from response
+        image_data = self._extract_image_data(response)
+        
+        if not image_data:
+            logger.error("Could not extract image data from response")
+            return None
+        
+        # Process and return image data
+        return self._process_image_data(image_data)
+    
     def _extract_image_data(self, response):
         """Extract image data from Gemini response"""
-        # Method 1: Check candidates for inline_data
-        if hasattr(response, 'candidates') and response.candidates:
-            logger.info(f"Found {len(response.candidates)} candidates")
-            for candidate in response.candidates:
-                if hasattr(candidate, 'content') and candidate.content:
-                    if hasattr(candidate.content, 'parts') and candidate.content.parts:
-                        logger.info(f"Found {len(candidate.content.parts)} parts")
-                        for part in candidate.content.parts:
-                            # Check for inline_data
-                            if hasattr(part, 'inline_data') and part.inline_data:
-                                if hasattr(part.inline_data, 'data'):
-                                    logger.info("✓ Found inline_data")
-                                    return part.inline_data.data
-                            # Check for blob
-                            if hasattr(part, 'blob') and part.blob:
-                                logger.info("✓ Found blob")
-                                return part.blob
+        # The image arrives as an inline_data part; the SDK has already decoded it
+        for candidate in getattr(response, 'candidates', None) or []:
+            content = candidate.content
+            for part in (content.parts if content else None) or []:
+                blob = part.inline_data
+                if blob is not None and blob.data:
+                    logger.info(f"✓ Found inline_data ({blob.mime_type})")
+                    return blob.data
         
-        # Method 2: Check for direct text (base64)
-        if hasattr(response, 'text'):
+        # Fallback: base64 image returned as text
+        text_parts = [
+            part.text
+            for candidate in getattr(response, 'candidates', None) or []
+            for part in ((candidate.content.parts if candidate.content else None) or [])
+            if part.text
+        ]
+        if text_parts:
             logger.info("Checking text response")
-            return response.text
+            return "".join(text_parts)
         
         return None
     
     def _process_image_data(self, image_data):
-        """Process image data (decode base64 if needed)"""
+        """Process image data (decode base64 if needed), without copying raw bytes"""
         # If base64 string
         if isinstance(image_data, str):
             try:
-                image_data = image_data.strip()
-                decoded_data = base64.b64decode(image_data)
+                decoded_data = decode_base64(image_data)
                 logger.info(f"✓ Decoded base64 image: {len(decoded_data)} bytes")
                 return decoded_data
-            except Exception as e:
+            except (binascii.Error, ValueError) as e:
                 logger.error(f"Failed to decode base64: {e}")
                 return None
         
         # If already bytes
-        if isinstance(image_data, bytes):
+        if isinstance(image_data, (bytes, bytearray, memoryview)):
             logger.info(f"✓ Got raw image bytes: {len(image_data)} bytes")
             return image_data
         
@@ -227,45 +350,104 @@ NO text, NO people, NO frames, immersive full-bleed composition."""
     
     def save_image(self, image_data: bytes, filepath: str) -> bool:
         """Save and validate image - optimized for LinkedIn"""
+        return bool(self.save_image_in_background(image_data, filepath).result())
+    
+    def save_image_in_background(self, image_data: bytes, filepath: str) -> Future:
+        """
+        Resize and encode the image in a worker process
+        
+        Returns a Future resolving to {"linkedin": path} for the file
+        actually written, or {} if nothing was. The file type follows
+        IMAGE_ENCODER (see self.image_extension) unless rendering failed
+        and the source bytes were saved as they are.
+        """
+        return self._render_in_background(
+            image_data, {PRIMARY_RENDITION: filepath}, {PRIMARY_RENDITION: IMAGE_OUTPUT_SIZE}
+        )
+    
+    def save_renditions_in_background(self, image_data: bytes, base_path: str) -> Future:
+        """
+        Render every IMAGE_RENDITIONS size from one decode in a worker process
+        
+        Args:
+            image_data: Generated image bytes
+            base_path: Output path without extension; the LinkedIn rendition is
+                written to base_path + extension, others get a _<name> suffix
+            
+        Returns:
+            A Future resolving to the rendition paths actually written, by
+            name; only the primary one if rendering failed, {} if nothing was
+        """
+        return self._render_in_background(image_data, rendition_paths(base_path), IMAGE_RENDITIONS)
+    
+    def _render_in_background(self, image_data: bytes, paths: Dict[str, str],
+                              renditions: Dict[str, Tuple[int, int]]) -> Future:
+        saved = Future()
         if not image_data:
             logger.error("No image data to save")
-            return False
+            saved.set_result({})
+            return saved
+        
+        logger.info(f"Rendering {len(renditions)} image rendition(s) off-thread: "
+                    f"{len(image_data)} bytes -> {IMAGE_ENCODER}")
         
-        logger.info(f"Attempting to save image: {len(image_data)} bytes")
+        def finish(render: Future):
+            saved.set_result(self._finish_save(render, image_data, paths))
         
         try:
-            image = Image.open(io.BytesIO(image_data))
-            logger.info(f"Original image - Format: {image.format}, Size: {image.size}, Mode: {image.mode}")
-            
-            # Convert to RGB if needed
-            if image.mode not in ('RGB', 'L'):
-                logger.info(f"Converting from {image.mode} to RGB")
-                image = image.convert('RGB')
-            
-            # Resize to LinkedIn optimal size (1200x675 for 16:9)
-            linkedin_size = (1200, 675)
-            if image.size != linkedin_size:
-                image = image.resize(linkedin_size, Image.Resampling.LANCZOS)
-                logger.info(f"Resized to LinkedIn optimal: {linkedin_size}")
-            
-            # Save as high-quality PNG
-            image.save(filepath, 'PNG', optimize=True, compress_level=6)
-            logger.info(f"✓ Image saved successfully: {filepath}")
-            logger.info(f"  Final dimensions: {image.size}")
-            return True
+            render = get_image_processor().submit(image_data, paths, renditions)
+        except Exception as e:
+            # e.g. a broken worker pool; take the same fallback as a failed render
+            render = Future()
+            render.set_exception(e)
+        render.add_done_callback(finish)
+        return saved
+    
+    def _finish_save(self, render: Future, image_data: bytes, paths: Dict[str, str]) -> Dict[str, str]:
+        """
+        Log the rendered files, or fall back to writing the raw bytes as the primary image
+        
+        The fallback file takes the extension of the source format, not
+        the encoder's; the other renditions are not written.
+        """
+        try:
+            file_sizes = render.result()
+            for name, file_size in file_sizes.items():
+                logger.info(f"✓ Image saved successfully ({name}): {file_size} bytes")
+            logger.info(f"  Primary image: {paths[PRIMARY_RENDITION]}")
+            return dict(paths)
             
         except Exception as pil_error:
             logger.warning(f"PIL processing failed: {pil_error}")
             
+            extension = _source_extension(image_data)
+            if extension is None:
+                logger.error("Unrecognised image format, not saving the raw bytes")
+                return {}
+            
             # Fallback: direct binary write
+            filepath = os.path.splitext(paths[PRIMARY_RENDITION])[0] + extension
             try:
                 with open(filepath, 'wb') as f:
                     f.write(image_data)
                 
                 file_size = os.path.getsize(filepath)
                 logger.info(f"✓ Image saved (direct write): {filepath} ({file_size} bytes)")
-                return True
+                return {PRIMARY_RENDITION: filepath}
                 
             except Exception as write_error:
                 logger.error(f"Error saving image: {write_error}")
-                return False
\ No newline at end of file
+                return {}
+
+def _source_extension(image_data: bytes) -> Optional[str]:
+    """File extension for the format of raw image bytes, from their signature"""
+    head = bytes(image_data[:12])
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    return None
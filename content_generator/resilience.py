@@ -0,0 +1,118 @@
+"""
+Resilience - Retries, backoff and client-side rate limiting for Gemini calls
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+import httpx
+from google.genai import errors
+from config.settings import (
+    LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+)
+from content_generator.metrics import prompt_chars
+from utils.logger import setup_logger
+from utils.rate_limit import TokenBucket
+
+logger = setup_logger()
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def is_retryable(error: Exception) -> bool:
+    """Transient failures worth retrying; everything else is fatal"""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-suggested wait from a Retry-After header, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class RequestBudget:
+    """Requests-per-minute and tokens-per-minute buckets shared by all callers"""
+
+    def __init__(self, requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute / 60.0, requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """Reserve one request and its tokens; returns seconds to wait"""
+        return max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+
+class RetryPolicy:
+    """Exponential backoff with full jitter around one LLM request"""
+
+    def __init__(self, budget: RequestBudget, max_retries: int = LLM_MAX_RETRIES,
+                 base_delay: float = LLM_RETRY_BASE_DELAY, max_delay: float = LLM_RETRY_MAX_DELAY):
+        self.budget = budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number `attempt` (0-based)"""
+        suggested = retry_after_seconds(error)
+        if suggested is not None:
+            return min(self.max_delay, suggested)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, request: Callable[[], Any], estimated_tokens: int,
+             on_retry: Optional[Callable[[int, Exception], None]] = None) -> Any:
+        """Run a blocking request under the rate budget, retrying transient errors"""
+        for attempt in range(self.max_retries + 1):
+            wait = self.budget.reserve(estimated_tokens)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff(attempt, e)
+                logger.warning(f"Gemini request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                if on_retry:
+                    on_retry(attempt + 1, e)
+                time.sleep(delay)
+
+    async def acall(self, request: Callable[[], Awaitable[Any]], estimated_tokens: int,
+                    on_retry: Optional[Callable[[int, Exception], None]] = None) -> Any:
+        """Async version of call; waits never block the event loop"""
+        for attempt in range(self.max_retries + 1):
+            wait = self.budget.reserve(estimated_tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff(attempt, e)
+                logger.warning(f"Gemini request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                if on_retry:
+                    on_retry(attempt + 1, e)
+                await asyncio.sleep(delay)
+
+def estimate_tokens(contents: Any) -> int:
+    """Rough token count of a request (about 4 characters per token)"""
+    return max(1, prompt_chars(contents) // 4)
+
+_shared_policy: Optional[RetryPolicy] = None
+_shared_lock = threading.Lock()
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy and its rate budget"""
+    global _shared_policy
+    with _shared_lock:
+        if _shared_policy is None:
+            _shared_policy = RetryPolicy(RequestBudget())
+        return _shared_policy
@@ -0,0 +1,163 @@
+"""
+Response Cache - Content-addressed on-disk cache for Gemini responses
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from config.settings import (
+    LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TEXT_TTL_HOURS, LLM_CACHE_IMAGE_TTL_HOURS
+)
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+KIND_TEXT = "text"
+KIND_BLOB = "blob"
+
+class ResponseCache:
+    """
+    SQLite index of cached responses with image bytes kept as blob files
+
+    Keys are a SHA-256 of model, config and prompt. Entries expire per
+    kind (text or blob) and the least recently used are evicted once the
+    cache grows past its byte budget.
+    """
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = {
+            KIND_TEXT: LLM_CACHE_TEXT_TTL_HOURS * 3600,
+            KIND_BLOB: LLM_CACHE_IMAGE_TTL_HOURS * 3600
+        }
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   key TEXT PRIMARY KEY,
+                   kind TEXT NOT NULL,
+                   text TEXT,
+                   size INTEGER NOT NULL,
+                   created_at REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+
+    @staticmethod
+    def make_key(model: str, contents: Any, config: Any = None) -> str:
+        """Content address of a request"""
+        payload = json.dumps(
+            {"model": model, "config": _plain(config), "contents": _plain(contents)},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_text(self, key: str) -> Optional[str]:
+        """Cached text response, or None"""
+        row = self._lookup(key, KIND_TEXT)
+        return row[0] if row else None
+
+    def get_blob(self, key: str) -> Optional[bytes]:
+        """Cached binary response (image bytes), or None"""
+        if not self._lookup(key, KIND_BLOB):
+            return None
+        try:
+            with open(self._blob_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            self._delete(key)
+            return None
+
+    def put_text(self, key: str, text: str):
+        """Store a text response"""
+        self._store(key, KIND_TEXT, text, len(text.encode('utf-8')))
+
+    def put_blob(self, key: str, data: bytes):
+        """Store a binary response as its own file"""
+        tmp_path = f"{self._blob_path(key)}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._blob_path(key))
+        self._store(key, KIND_BLOB, None, len(data))
+
+    def _lookup(self, key: str, kind: str):
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT text, created_at FROM responses WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if not row:
+                return None
+            if now - row[1] > self.ttl_seconds[kind]:
+                self._delete_locked(key)
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return row
+
+    def _store(self, key: str, kind: str, text: Optional[str], size: int):
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, kind, text, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, text, size, now, now)
+                )
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Drop least recently used entries until under the byte budget"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._delete_locked(key)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._delete_locked(key)
+
+    def _delete_locked(self, key: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        try:
+            os.remove(self._blob_path(key))
+        except OSError:
+            pass
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.blob_dir, f"{key}.bin")
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly form of SDK request objects"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json', exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
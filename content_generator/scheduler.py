@@ -0,0 +1,87 @@
+"""
+Request Scheduler - Shared event loop with a max-in-flight limit for async Gemini calls
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+from config.settings import LLM_MAX_IN_FLIGHT
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class RequestScheduler:
+    """
+    Runs async LLM requests on one background event loop
+
+    Every async client call goes through the same loop, so the SDK's
+    async HTTP pool is never shared across loops, and a single semaphore
+    caps how many requests are in flight process-wide. Callers may be
+    synchronous (run) or live on their own event loop (run_async).
+    """
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT):
+        self.max_in_flight = max(1, max_in_flight)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def submit(self, request: Callable[[], Awaitable[Any]], guarded: bool = True) -> Future:
+        """
+        Schedule a request factory and return a concurrent Future
+
+        The request runs in the caller's context, so its metrics stage
+        carries over. Pass guarded=False for coroutines that fan out into
+        guarded requests themselves; holding a slot while waiting on them
+        could otherwise exhaust the semaphore and deadlock.
+        """
+        loop = self._ensure_loop()
+        coroutine = self._guarded(request) if guarded else request()
+        return asyncio.run_coroutine_threadsafe(_in_context(coroutine, contextvars.copy_context()), loop)
+
+    def run(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a request from synchronous code and wait for its result"""
+        return self.submit(request).result()
+
+    async def run_async(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a request from any event loop"""
+        return await asyncio.wrap_future(self.submit(request))
+
+    async def _guarded(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        async with self._semaphore:
+            return await request()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the scheduler loop thread on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=serve, name="llm-scheduler", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+                logger.info(f"LLM request scheduler started (max {self.max_in_flight} in flight)")
+            return self._loop
+
+async def _in_context(coroutine: Awaitable[Any], context: contextvars.Context) -> Any:
+    return await asyncio.get_running_loop().create_task(coroutine, context=context)
+
+_shared_scheduler: Optional[RequestScheduler] = None
+_shared_lock = threading.Lock()
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide request scheduler"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RequestScheduler()
+        return _shared_scheduler
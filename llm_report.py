@@ -0,0 +1,46 @@
+"""
+Summarise LLM call metrics per pipeline stage
+Run: python llm_report.py [--run RUN_ID | --last]
+"""
+
+import argparse
+from content_generator.metrics import MetricsLog, summarize
+from config.settings import LLM_METRICS_PATH
+
+def print_summary(records):
+    """Print one row per stage plus a total"""
+    summary = summarize(records)
+    header = f"{'stage':<14}{'calls':>6}{'errors':>7}{'cached':>7}{'retries':>8}{'prompt tok':>11}{'output tok':>11}{'avg ms':>9}{'p95 ms':>9}{'total s':>9}"
+    print(header)
+    print("-" * len(header))
+    for stage, row in sorted(summary.items(), key=lambda item: -item[1]["latency_ms_total"]):
+        print(f"{stage:<14}{row['calls']:>6}{row['errors']:>7}{row['cache_hits']:>7}{row['retries']:>8}"
+              f"{row['prompt_tokens']:>11}{row['output_tokens']:>11}{row['latency_ms_avg']:>9.0f}"
+              f"{row['latency_ms_p95']:>9.0f}{row['latency_ms_total'] / 1000:>9.1f}")
+
+    total = summarize([dict(r, stage="total") for r in records]).get("total")
+    if total:
+        print("-" * len(header))
+        print(f"{'total':<14}{total['calls']:>6}{total['errors']:>7}{total['cache_hits']:>7}{total['retries']:>8}"
+              f"{total['prompt_tokens']:>11}{total['output_tokens']:>11}{total['latency_ms_avg']:>9.0f}"
+              f"{total['latency_ms_p95']:>9.0f}{total['latency_ms_total'] / 1000:>9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise LLM call metrics per pipeline stage")
+    parser.add_argument("--path", default=LLM_METRICS_PATH, help="Metrics JSONL file")
+    parser.add_argument("--run", help="Only include one run id")
+    parser.add_argument("--last", action="store_true", help="Only include the most recent run")
+    args = parser.parse_args()
+
+    log = MetricsLog(args.path)
+    records = log.read(args.run)
+    if args.last and records:
+        last_run = max(r.get("run_id", "") for r in records)
+        records = [r for r in records if r.get("run_id") == last_run]
+
+    if not records:
+        print(f"No LLM metrics found in {args.path}")
+    else:
+        runs = sorted({r.get("run_id") for r in records})
+        print(f"LLM calls from {len(runs)} run(s): {runs[0]} .. {runs[-1]}\n")
+        print_summary(records)
@@ -4,22 +4,143 @@ LinkedIn AI Agent - Complete with Technical Focus and Nano Banana
 
 import os
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
-from config.settings import NEWS_SOURCES, EXCEL_PATH
-from scrapers.rss_scraper import RSSFeedScraper
+from config.settings import (
+    NEWS_SOURCES, EXCEL_PATH, EXPORT_SCRAPED_JSON, DEDUP_ENABLED, POST_STREAMING_ENABLED,
+    IMAGE_PROMPT_CONTEXT_CHARS, IMAGE_CANDIDATES
+)
+from scrapers.scrape_engine import ScrapeEngine
 from content_generator.gemini_client import GeminiClient
 from content_generator.nano_banana_client import NanoBananaClient
+from content_generator.image_processing import PRIMARY_RENDITION, get_image_processor
+from content_generator.metrics import llm_stage
 from content_generator.prompt_templates import LINKEDIN_POST_TEMPLATE, TOPIC_SELECTION_PROMPT
 from managers.topic_manager import TopicManager
 from managers.excel_manager import ExcelManager
+from managers.article_store import ArticleStore
+from managers.deduplicator import NearDuplicateCollapser
 from managers.source_validator import SourceValidator
 from utils.logger import setup_logger
 
 load_dotenv()
 logger = setup_logger()
 
+def write_post_header(f, topic: str):
+    """Title block of the output file, up to where the post text starts"""
+    f.write("="*70 + "\n")
+    f.write("LINKEDIN POST - TECHNICAL AI INNOVATION\n")
+    f.write("="*70 + "\n\n")
+    f.write(f"TOPIC: {topic}\n\n")
+    
+    f.write("-"*70 + "\n")
+    f.write("POST CONTENT:\n")
+    f.write("-"*70 + "\n")
+
+def write_post_details(f, image_filepath, image_prompt: str, sources: list, image_renditions: Optional[dict] = None):
+    """Image, sources and next-steps sections that follow the post text"""
+    if image_filepath:
+        f.write("-"*70 + "\n")
+        f.write("GENERATED IMAGE:\n")
+        f.write("-"*70 + "\n")
+        f.write(f"Image file: {image_filepath}\n")
+        for name, path in (image_renditions or {}).items():
+            if path != image_filepath:
+                f.write(f"  {name}: {path}\n")
+        f.write(f"Image prompt used: {image_prompt}\n\n")
+    
+    f.write("-"*70 + "\n")
+    f.write("SOURCES FOR VERIFICATION:\n")
+    f.write("-"*70 + "\n")
+    for i, source in enumerate(sources, 1):
+        f.write(f"{i}. {source['title']}\n")
+        f.write(f"   {source['url']}\n\n")
+    
+    f.write("="*70 + "\n")
+    f.write("NEXT STEPS:\n")
+    f.write("1. Review the technical post content\n")
+    f.write("2. Check the AI-generated image\n")
+    f.write("3. Verify all sources are accurate\n")
+    f.write("4. Post to LinkedIn with image\n")
+    f.write("5. Update Excel with posted=True\n")
+    f.write("="*70 + "\n")
+
+def generate_image_prompt(nano_banana: NanoBananaClient, topic: str, post_content: str) -> str:
+    """Image prompt for a post, tagged as its own metrics stage"""
+    with llm_stage("image_prompt"):
+        return nano_banana.generate_image_prompt(topic, post_content)
+
+def generate_image(nano_banana: NanoBananaClient, image_prompt: str, candidates: int = IMAGE_CANDIDATES) -> Optional[bytes]:
+    """Image bytes for a prompt, tagged as their own metrics stage"""
+    with llm_stage("image"):
+        return nano_banana.generate_linkedin_image(image_prompt, candidates)
+
+def start_image_if_prompt_known(nano_banana: NanoBananaClient, topic: str,
+                                candidates: int = IMAGE_CANDIDATES) -> Tuple[Optional[str], Optional[Future]]:
+    """
+    Start the image right away when its prompt needs no post (stored or templated)
+    
+    Returns the prompt and the pending image, or (None, None) when the
+    prompt still has to be generated from the post.
+    """
+    image_prompt = nano_banana.known_image_prompt(topic)
+    if not image_prompt:
+        return None, None
+    
+    logger.info("Image prompt known for this topic, generating the image alongside the post")
+    background = ThreadPoolExecutor(max_workers=1)
+    try:
+        return image_prompt, background.submit(generate_image, nano_banana, image_prompt, candidates)
+    finally:
+        background.shutdown(wait=False)
+
+class PostStreamError(Exception):
+    """Streaming failed part-way; carries the image prompt already started, if any"""
+    
+    def __init__(self, cause: Exception, image_prompt_future: Optional[Future]):
+        super().__init__(str(cause))
+        self.image_prompt_future = image_prompt_future
+
+def stream_post_to_file(gemini: GeminiClient, nano_banana: NanoBananaClient, topic: str,
+                        articles: list, output_file: str,
+                        start_image_prompt: bool = True) -> Tuple[str, Optional[Future]]:
+    """
+    Stream the post into the output file as chunks arrive
+    
+    The image prompt only reads the first IMAGE_PROMPT_CONTEXT_CHARS of the
+    post, so it is started in the background as soon as those exist
+    (unless start_image_prompt is False because it is already known).
+    Returns the full post and the pending image prompt (None if the post
+    ended up shorter than that prefix). A failure mid-stream raises
+    PostStreamError, which keeps the pending image prompt for reuse.
+    """
+    background = ThreadPoolExecutor(max_workers=1)
+    image_prompt_future = None
+    pieces, length = [], 0
+    try:
+        with open(output_file, "w", encoding='utf-8') as f:
+            write_post_header(f, topic)
+            with llm_stage("post"):
+                for chunk in gemini.stream_post(topic, articles, LINKEDIN_POST_TEMPLATE):
+                    f.write(chunk)
+                    f.flush()
+                    pieces.append(chunk)
+                    length += len(chunk)
+                    if start_image_prompt and image_prompt_future is None and length >= IMAGE_PROMPT_CONTEXT_CHARS:
+                        logger.info(f"First {length} characters streamed, starting image prompt")
+                        image_prompt_future = background.submit(
+                            generate_image_prompt, nano_banana, topic, "".join(pieces)
+                        )
+            f.write("\n\n")
+    except Exception as e:
+        raise PostStreamError(e, image_prompt_future) from e
+    finally:
+        background.shutdown(wait=False)
+    return "".join(pieces), image_prompt_future
+
 def main():
     """Main execution function"""
     logger.info("="*70)
@@ -29,12 +150,7 @@ def main():
     try:
         # Step 1: Scrape articles from technical sources
         logger.info("\nStep 1: Scraping technical AI sources...")
-        all_articles = []
-        
-        for source in NEWS_SOURCES:
-            scraper = RSSFeedScraper(source['name'], source['url'])
-            articles = scraper.scrape()
-            all_articles.extend(articles)
+        all_articles = ScrapeEngine(NEWS_SOURCES).run()
         
         logger.info(f"Total articles scraped: {len(all_articles)}")
         
@@ -42,18 +158,28 @@ def main():
             logger.error("No articles found! Check your internet connection.")
             return
         
-        # FIXED: Save raw data (OVERWRITE, don't append)
-        scraped_data = {
-            "last_updated": datetime.now().isoformat(),
-            "articles": all_articles,  # Fresh data only
-            "total_articles": len(all_articles),
-            "sources_count": len(set(article.get('source') for article in all_articles))
-        }
-        
-        with open("data/scraped_data.json", "w", encoding='utf-8') as f:  # 'w' not 'a'
-            json.dump(scraped_data, f, indent=2, ensure_ascii=False)
+        # Record articles in the incremental store (only new URLs are inserted)
+        article_store = ArticleStore()
+        new_articles = article_store.upsert_articles(all_articles)
+        logger.info(f"✓ {len(new_articles)} articles not seen in earlier runs")
         
-        logger.info(f"✓ Saved {len(all_articles)} fresh articles to JSON")
+        # Optional export of this run's articles (OVERWRITE, don't append)
+        if EXPORT_SCRAPED_JSON:
+            scraped_data = {
+                "last_updated": datetime.now().isoformat(),
+                "articles": all_articles,  # Fresh data only
+                "total_articles": len(all_articles),
+                "sources_count": len(set(article.get('source') for article in all_articles))
+            }
+            
+            with open("data/scraped_data.json", "w", encoding='utf-8') as f:  # 'w' not 'a'
+                json.dump(scraped_data, f, indent=2, ensure_ascii=False)
+            
+            logger.info(f"✓ Exported {len(all_articles)} fresh articles to JSON")
+
+        # Collapse the same story reported by several sources before scoring
+        if DEDUP_ENABLED:
+            all_articles = NearDuplicateCollapser().collapse(all_articles)
 
         # Step 2: LLM-powered topic selection
         logger.info("\nStep 2: LLM-powered topic selection...")
@@ -69,17 +195,43 @@ def main():
         logger.info(f"✓ Selected topic: {selected_topic}")
 
         
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = f"outputs/ready_posts/post_{timestamp}.txt"
+        gemini = GeminiClient()
+        nano_banana = NanoBananaClient()
+        get_image_processor().warm_up()
+        
+        # A stored image prompt takes the prompt and image calls off the post's critical path
+        image_prompt, image_future = start_image_if_prompt_known(nano_banana, selected_topic)
+        
         # Step 3: Generate technical LinkedIn post
         logger.info("\nStep 3: Generating technical LinkedIn post...")
-        gemini = GeminiClient()
-        post_content = gemini.generate_post(
-            selected_topic, 
-            relevant_articles, 
-            LINKEDIN_POST_TEMPLATE
-        )
+        image_prompt_future = None
+        post_content = ""
+        if POST_STREAMING_ENABLED:
+            try:
+                post_content, image_prompt_future = stream_post_to_file(
+                    gemini, nano_banana, selected_topic, relevant_articles, output_file,
+                    start_image_prompt=image_prompt is None
+                )
+            except PostStreamError as e:
+                # The image prompt only needs the topic and the post's opening, so keep it
+                logger.warning(f"Post streaming failed ({e}), retrying without streaming")
+                post_content, image_prompt_future = "", e.image_prompt_future
+        
+        streamed = bool(post_content)
+        if not streamed:
+            with llm_stage("post"):
+                post_content = gemini.generate_post(
+                    selected_topic, 
+                    relevant_articles, 
+                    LINKEDIN_POST_TEMPLATE
+                )
         
         if not post_content:
             logger.error("Failed to generate post content!")
+            if os.path.exists(output_file):
+                os.remove(output_file)
             return
         
         logger.info(f"✓ Post generated ({len(post_content)} characters)")
@@ -91,65 +243,53 @@ def main():
         
         # Step 5: Generate optimized image prompt with Gemini 2.0
         logger.info("\nStep 5: Creating AI-optimized image prompt...")
-        nano_banana = NanoBananaClient()
-        image_prompt = nano_banana.generate_image_prompt(selected_topic, post_content)
+        if image_prompt:
+            logger.info("✓ Image prompt was known before the post, no LLM call needed")
+        elif image_prompt_future:
+            image_prompt = image_prompt_future.result()
+        else:
+            image_prompt = generate_image_prompt(nano_banana, selected_topic, post_content)
         
         # Step 6: Generate image with Nano Banana
         logger.info("\nStep 6: Generating LinkedIn image with Nano Banana...")
-        image_data = nano_banana.generate_linkedin_image(image_prompt)
+        if image_future:
+            image_data = image_future.result()
+        else:
+            image_data = generate_image(nano_banana, image_prompt)
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        image_filepath = None
+        image_saved = None
         
         if image_data:
-            image_filepath = f"outputs/ready_posts/post_{timestamp}.png"
-            nano_banana.save_image(image_data, image_filepath)
+            # All sizes come from one decode in a worker process while the tracker loads
+            image_saved = nano_banana.save_renditions_in_background(
+                image_data, f"outputs/ready_posts/post_{timestamp}"
+            )
         else:
             logger.warning("Could not generate image, proceeding without it")
         
         # Step 7: Save to Excel (FIXED - include image path)
         logger.info("\nStep 7: Saving to Excel tracker...")
         excel_manager = ExcelManager(EXCEL_PATH)
-        excel_manager.add_post(selected_topic, post_content, sources, image_filepath)
+        
+        # Only files that were actually written are recorded
+        image_renditions = image_saved.result() if image_saved else {}
+        image_filepath = image_renditions.get(PRIMARY_RENDITION)
+        if image_saved and not image_filepath:
+            logger.warning("Image could not be written, proceeding without it")
+        
+        excel_manager.add_post(selected_topic, post_content, sources, image_filepath, image_renditions or None)
 
         
-        # Step 8: Create comprehensive output file
+        # Step 8: Create comprehensive output file (the post itself is already in it when streamed)
         logger.info("\nStep 8: Creating output file...")
-        output_file = f"outputs/ready_posts/post_{timestamp}.txt"
-        
-        with open(output_file, "w", encoding='utf-8') as f:
-            f.write("="*70 + "\n")
-            f.write("LINKEDIN POST - TECHNICAL AI INNOVATION\n")
-            f.write("="*70 + "\n\n")
-            f.write(f"TOPIC: {selected_topic}\n\n")
-            
-            f.write("-"*70 + "\n")
-            f.write("POST CONTENT:\n")
-            f.write("-"*70 + "\n")
-            f.write(post_content + "\n\n")
-            
-            if image_filepath:
-                f.write("-"*70 + "\n")
-                f.write("GENERATED IMAGE:\n")
-                f.write("-"*70 + "\n")
-                f.write(f"Image file: {image_filepath}\n")
-                f.write(f"Image prompt used: {image_prompt}\n\n")
-            
-            f.write("-"*70 + "\n")
-            f.write("SOURCES FOR VERIFICATION:\n")
-            f.write("-"*70 + "\n")
-            for i, source in enumerate(sources, 1):
-                f.write(f"{i}. {source['title']}\n")
-                f.write(f"   {source['url']}\n\n")
-            
-            f.write("="*70 + "\n")
-            f.write("NEXT STEPS:\n")
-            f.write("1. Review the technical post content\n")
-            f.write("2. Check the AI-generated image\n")
-            f.write("3. Verify all sources are accurate\n")
-            f.write("4. Post to LinkedIn with image\n")
-            f.write("5. Update Excel with posted=True\n")
-            f.write("="*70 + "\n")
+        if streamed:
+            with open(output_file, "a", encoding='utf-8') as f:
+                write_post_details(f, image_filepath, image_prompt, sources, image_renditions)
+        else:
+            with open(output_file, "w", encoding='utf-8') as f:
+                write_post_header(f, selected_topic)
+                f.write(post_content + "\n\n")
+                write_post_details(f, image_filepath, image_prompt, sources, image_renditions)
         
         logger.info("\n" + "="*70)
         logger.info("✓ SUCCESS! Technical post ready:")
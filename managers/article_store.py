@@ -0,0 +1,135 @@
+"""
+Article Store - Incremental SQLite storage for scraped articles
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional
+from config.settings import ARTICLE_DB_PATH
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    source TEXT,
+    published TEXT,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    articles_seen INTEGER NOT NULL,
+    articles_new INTEGER NOT NULL
+);
+"""
+
+class ArticleStore:
+    """SQLite (WAL) article store with a unique URL index"""
+
+    def __init__(self, db_path: str = ARTICLE_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        logger.info(f"Article store initialized: {db_path}")
+
+    def upsert_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Insert new articles and refresh last_seen on known ones
+
+        Args:
+            articles: Scraped article dictionaries (must have a url)
+
+        Returns:
+            The articles whose URL had never been seen before
+        """
+        now = datetime.now().isoformat()
+
+        with self._lock, self.conn:
+            before = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+
+            rows = [
+                (
+                    article['url'],
+                    article.get('title', ''),
+                    article.get('summary', ''),
+                    article.get('source'),
+                    article.get('date'),
+                    json.dumps(article, ensure_ascii=False),
+                    now,
+                    now
+                )
+                for article in articles if article.get('url')
+            ]
+            self.conn.executemany(
+                """INSERT INTO articles (url, title, summary, source, published, data, first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       title = excluded.title,
+                       summary = excluded.summary,
+                       data = excluded.data,
+                       last_seen = excluded.last_seen""",
+                rows
+            )
+
+            new_urls = {
+                row['url'] for row in
+                self.conn.execute("SELECT url FROM articles WHERE id > ?", (before,))
+            }
+            self.conn.execute(
+                "INSERT INTO runs (started_at, articles_seen, articles_new) VALUES (?, ?, ?)",
+                (now, len(rows), len(new_urls))
+            )
+
+        new_articles = [article for article in articles if article.get('url') in new_urls]
+        logger.info(f"✓ Article store: {len(new_articles)} new of {len(rows)} scraped")
+        return new_articles
+
+    def last_run_time(self) -> Optional[str]:
+        """Start time of the previous run (the one before the latest)"""
+        with self._lock:
+            rows = self.conn.execute("SELECT started_at FROM runs ORDER BY id DESC LIMIT 2").fetchall()
+        return rows[1]['started_at'] if len(rows) > 1 else None
+
+    def get_articles_since(self, since: Optional[str]) -> List[Dict]:
+        """Articles first seen after a timestamp (all articles if None)"""
+        with self._lock:
+            if since is None:
+                rows = self.conn.execute("SELECT data FROM articles ORDER BY id").fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT data FROM articles WHERE first_seen > ? ORDER BY id", (since,)
+                ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def get_unseen_since_last_run(self) -> List[Dict]:
+        """Articles first seen in the latest run"""
+        return self.get_articles_since(self.last_run_time())
+
+    def count(self) -> int:
+        """Total number of stored articles"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
@@ -0,0 +1,135 @@
+"""
+Near-Duplicate Collapser - MinHash + LSH banding across sources
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Set
+import numpy as np
+from config.settings import DEDUP_THRESHOLD, MINHASH_PERMUTATIONS, LSH_BANDS
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Smallest prime above 2**32; with 32-bit a, b and x, (a * x + b) fits in uint64
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+class NearDuplicateCollapser:
+    """Collapses articles describing the same story into one cluster"""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD,
+                 num_perm: int = MINHASH_PERMUTATIONS, bands: int = LSH_BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("MINHASH_PERMUTATIONS must be divisible by LSH_BANDS")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2**32 - 1, size=num_perm, dtype=np.uint64)
+
+    def collapse(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Merge near-duplicate articles
+
+        The first article of each cluster (in input order) is kept as the
+        representative and gains 'source_urls' and 'cluster_members'
+        listing every copy.
+
+        Returns:
+            One article per cluster, in input order
+        """
+        if len(articles) < 2:
+            return articles
+
+        texts = [self._article_text(a) for a in articles]
+        signatures = np.vstack([self.signature(text) for text in texts])
+        # Articles with no words would all share the empty signature
+        has_text = [bool(self._shingles(text)) for text in texts]
+        parent = list(range(len(articles)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Only articles sharing at least one band bucket are ever compared
+        for i, j in self._candidate_pairs(signatures):
+            if not (has_text[i] and has_text[j]):
+                continue
+            root_i, root_j = find(i), find(j)
+            if root_i == root_j:
+                continue
+            similarity = float(np.mean(signatures[i] == signatures[j]))
+            if similarity >= self.threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for index in range(len(articles)):
+            clusters[find(index)].append(index)
+
+        collapsed = []
+        for root in sorted(clusters):
+            members = [articles[i] for i in clusters[root]]
+            if len(members) == 1:
+                collapsed.append(members[0])
+                continue
+            representative = members[0].copy()
+            representative['source_urls'] = [m.get('url', '') for m in members]
+            representative['cluster_members'] = [
+                {'title': m.get('title', ''), 'url': m.get('url', ''), 'source': m.get('source', '')}
+                for m in members
+            ]
+            collapsed.append(representative)
+
+        merged = len(articles) - len(collapsed)
+        logger.info(f"✓ Collapsed {merged} near-duplicate articles into {len(collapsed)} unique stories")
+        return collapsed
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text's word shingles"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> Set[tuple]:
+        """Index pairs that collide in at least one LSH band"""
+        pairs = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            band_slice = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for index, row in enumerate(band_slice):
+                buckets[row.tobytes()].append(index)
+            for bucket in buckets.values():
+                if len(bucket) > 1:
+                    for x in range(len(bucket)):
+                        for y in range(x + 1, len(bucket)):
+                            pairs.add((bucket[x], bucket[y]))
+        return pairs
+
+    @staticmethod
+    def _article_text(article: Dict) -> str:
+        """Title plus summary with markup removed"""
+        summary = _TAG_PATTERN.sub(" ", article.get('summary', '') or '')
+        return f"{article.get('title', '')} {summary}"
+
+    @staticmethod
+    def _shingles(text: str) -> Set[str]:
+        """Word unigrams and bigrams of lowercased text"""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        shingles = set(tokens)
+        shingles.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return shingles
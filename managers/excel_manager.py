@@ -2,9 +2,13 @@
 Excel Manager - Handles all Excel operations - FIXED
 """
 
+import json
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Optional
+from config.settings import EXCEL_COLUMNS, SEMANTIC_INDEX_ENABLED
+from managers.posted_index import get_posted_index
+from managers.semantic_index import get_semantic_index
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -17,15 +21,23 @@ class ExcelManager:
         self.excel_path = excel_path
         logger.info(f"Excel manager initialized: {excel_path}")
     
-    def add_post(self, topic: str, content: str, sources: List[Dict], image_path: Optional[str] = None):
+    def add_post(self, topic: str, content: str, sources: List[Dict], image_path: Optional[str] = None,
+                 rendition_paths: Optional[Dict[str, str]] = None):
         """Add a new post to the Excel tracker"""
         try:
+            # Pick up any edits made to the tracker outside this process
+            posted_index = get_posted_index(self.excel_path)
+            posted_index.refresh()
+            semantic_index = get_semantic_index(self.excel_path) if SEMANTIC_INDEX_ENABLED else None
+            if semantic_index is not None:
+                semantic_index.refresh()
+            
             # Read existing data
             try:
                 df = pd.read_excel(self.excel_path)
             except FileNotFoundError:
                 # If file doesn't exist, create empty DataFrame
-                df = pd.DataFrame(columns=["date", "topic", "post_content", "sources", "posted", "posted_date", "image_path"])
+                df = pd.DataFrame(columns=EXCEL_COLUMNS)
             
             # Create new row
             new_row = {
@@ -35,7 +47,8 @@ class ExcelManager:
                 "sources": str(sources),
                 "posted": False,
                 "posted_date": None,
-                "image_path": image_path if image_path else ""
+                "image_path": image_path if image_path else "",
+                "rendition_paths": json.dumps(rendition_paths) if rendition_paths else ""
             }
             
             # Add new row
@@ -43,6 +56,9 @@ class ExcelManager:
             
             # Save to Excel
             df.to_excel(self.excel_path, index=False)
+            posted_index.add(topic)
+            if semantic_index is not None:
+                semantic_index.add(topic, content)
             
             logger.info(f"✓ Added post to tracker: {topic[:50]}...")
             
@@ -69,7 +85,7 @@ class ExcelManager:
             return pd.read_excel(self.excel_path)
         except FileNotFoundError:
             logger.warning("Excel file not found, returning empty DataFrame")
-            return pd.DataFrame(columns=["date", "topic", "post_content", "sources", "posted", "posted_date", "image_path"])
+            return pd.DataFrame(columns=EXCEL_COLUMNS)
         except Exception as e:
             logger.error(f"Error reading Excel: {e}")
             return pd.DataFrame()
@@ -0,0 +1,146 @@
+"""
+Posted Topic Index - Inverted token index over previously posted topics
+"""
+
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+import pandas as pd
+from config.settings import EXCEL_PATH, POSTED_INDEX_PATH
+from utils.helpers import load_json, save_json_atomic
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class PostedTopicIndex:
+    """
+    Token -> topic postings so duplicate checks only touch topics that
+    share a word with the candidate title
+
+    Titles are tokenized as lowercased whitespace-split word sets, and
+    only topics sharing a token can have non-zero Jaccard similarity,
+    so decisions are identical to a full Jaccard scan.
+    """
+
+    def __init__(self, excel_path: str = EXCEL_PATH, index_path: str = POSTED_INDEX_PATH):
+        self.excel_path = excel_path
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self.topics: List[str] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._indexed_mtime: Optional[float] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def is_duplicate(self, title: str, threshold: float = 0.7) -> bool:
+        """True if any posted topic has Jaccard similarity > threshold"""
+        return self.best_match(title)[1] > threshold
+
+    def best_match(self, title: str):
+        """
+        Most similar posted topic
+
+        Returns:
+            (topic, jaccard) or (None, 0.0) when nothing shares a token
+        """
+        tokens = self._tokenize(title)
+        if not tokens:
+            return None, 0.0
+
+        with self._lock:
+            overlap: Dict[int, int] = defaultdict(int)
+            for token in tokens:
+                for topic_id in self._postings.get(token, ()):
+                    overlap[topic_id] += 1
+
+            best_id, best_score = None, 0.0
+            for topic_id, intersection in overlap.items():
+                union = len(tokens) + self._sizes[topic_id] - intersection
+                score = intersection / union if union > 0 else 0.0
+                if score > best_score:
+                    best_id, best_score = topic_id, score
+
+        return (self.topics[best_id] if best_id is not None else None), best_score
+
+    def refresh(self):
+        """Rebuild if the Excel tracker was changed outside this index"""
+        if self._indexed_mtime != self._excel_mtime():
+            self.rebuild()
+
+    def add(self, topic: str):
+        """Index a newly posted topic and persist the index"""
+        with self._lock:
+            self._add(topic)
+            self._save()
+
+    def _add(self, topic: str):
+        if not isinstance(topic, str):
+            return
+        topic_id = len(self.topics)
+        tokens = self._tokenize(topic)
+        self.topics.append(topic)
+        self._sizes.append(len(tokens))
+        for token in tokens:
+            self._postings[token].append(topic_id)
+
+    def _load(self):
+        """Load the saved index, rebuilding from Excel if the tracker changed"""
+        data = load_json(self.index_path)
+        if data and data.get("excel_mtime") == self._excel_mtime():
+            self.topics = data.get("topics", [])
+            self._sizes = data.get("sizes", [])
+            self._postings = defaultdict(list, data.get("postings", {}))
+            self._indexed_mtime = data["excel_mtime"]
+            return
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the whole index from the Excel tracker"""
+        with self._lock:
+            self.topics, self._sizes = [], []
+            self._postings = defaultdict(list)
+            try:
+                df = pd.read_excel(self.excel_path)
+                posted_topics = df['topic'].tolist() if not df.empty else []
+            except FileNotFoundError:
+                posted_topics = []
+            for topic in posted_topics:
+                self._add(topic)
+            self._save()
+        logger.info(f"Rebuilt posted topic index: {len(self.topics)} topics")
+
+    def _save(self):
+        self._indexed_mtime = self._excel_mtime()
+        try:
+            save_json_atomic({
+                "excel_mtime": self._indexed_mtime,
+                "topics": self.topics,
+                "sizes": self._sizes,
+                "postings": self._postings
+            }, self.index_path)
+        except Exception as e:
+            logger.error(f"Error saving posted topic index: {e}")
+
+    def _excel_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.excel_path)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _tokenize(text: str) -> Set[str]:
+        return set(text.lower().split()) if isinstance(text, str) else set()
+
+_shared_indexes: Dict[str, PostedTopicIndex] = {}
+_shared_lock = threading.Lock()
+
+def get_posted_index(excel_path: str = EXCEL_PATH) -> PostedTopicIndex:
+    """Return the process-wide index for an Excel tracker"""
+    with _shared_lock:
+        if excel_path not in _shared_indexes:
+            _shared_indexes[excel_path] = PostedTopicIndex(excel_path)
+        return _shared_indexes[excel_path]
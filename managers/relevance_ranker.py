@@ -0,0 +1,112 @@
+"""
+Relevance Ranker - Local BM25 pre-ranking against a technical query profile
+"""
+
+import re
+from typing import List, Dict, Optional
+import numpy as np
+from config.settings import RELEVANCE_QUERY_PROFILE, BM25_K1, BM25_B
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_SUFFIXES = ("ation", "ing", "er", "ed")
+_KEEP_FINAL_S = ("ss", "is")  # "us" too, beyond acronyms like "gpus"
+STEMMER_VERSION = 2  # Bump when stem() changes; persisted embeddings are rebuilt
+
+def stem(token: str) -> str:
+    """
+    Very light suffix stripping so inflections share a stem
+
+    Plural/third-person 's' goes first, then one derivational suffix,
+    then a trailing 'e', so 'models'/'model', 'llms'/'llm',
+    'architectures'/'architecture' and 'raises'/'raised'/'raise' match.
+    """
+    if len(token) > 4 and token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif (len(token) > 3 and token.endswith("s") and not token.endswith(_KEEP_FINAL_S)
+          and not (len(token) > 4 and token.endswith("us"))):
+        token = token[:-1]
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            token = token[:-len(suffix)]
+            break
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+class BM25Ranker:
+    """
+    Scores articles against a weighted query profile with BM25
+
+    Only query-profile terms are counted, so the term-frequency matrix is
+    articles x profile terms and every score is computed in one NumPy pass.
+    Negative weights push matching articles (events, funding news) down.
+    """
+
+    def __init__(self, query_profile: Optional[Dict[str, float]] = None,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        profile = query_profile if query_profile is not None else RELEVANCE_QUERY_PROFILE
+        self.k1 = k1
+        self.b = b
+
+        # Several profile words may stem to the same term; keep the strongest weight
+        weights: Dict[str, float] = {}
+        for term, weight in profile.items():
+            stemmed = stem(term.lower())
+            if abs(weight) > abs(weights.get(stemmed, 0.0)):
+                weights[stemmed] = weight
+        self.terms = list(weights)
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.weights = np.array([weights[t] for t in self.terms], dtype=np.float64)
+
+    def score(self, articles: List[Dict]) -> np.ndarray:
+        """BM25 relevance of each article to the query profile"""
+        n_docs, n_terms = len(articles), len(self.terms)
+        if n_docs == 0 or n_terms == 0:
+            return np.zeros(n_docs)
+
+        doc_ids, term_ids, lengths = [], [], np.zeros(n_docs)
+        for doc_id, article in enumerate(articles):
+            tokens = self._tokens(article)
+            lengths[doc_id] = len(tokens)
+            for token in tokens:
+                term_id = self.term_ids.get(token)
+                if term_id is not None:
+                    doc_ids.append(doc_id)
+                    term_ids.append(term_id)
+
+        # Sparse (doc, term) pairs -> term-frequency matrix
+        tf = np.bincount(
+            np.asarray(doc_ids, dtype=np.int64) * n_terms + np.asarray(term_ids, dtype=np.int64),
+            minlength=n_docs * n_terms
+        ).reshape(n_docs, n_terms).astype(np.float64)
+
+        doc_freq = (tf > 0).sum(axis=0)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        avg_length = lengths.mean() or 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+
+        saturated = tf * (self.k1 + 1) / (tf + norm[:, None])
+        return saturated @ (idf * self.weights)
+
+    def top_k(self, articles: List[Dict], k: int) -> List[Dict]:
+        """Keep the k most relevant articles, preserving their input order"""
+        if len(articles) <= k:
+            return articles
+
+        scores = self.score(articles)
+        keep = np.sort(np.argsort(-scores, kind='stable')[:k])
+        logger.info(f"BM25 pre-ranking kept {k} of {len(articles)} articles "
+                    f"(score cut-off {scores[keep].min():.2f})")
+        return [articles[i] for i in keep]
+
+    @staticmethod
+    def _tokens(article: Dict) -> List[str]:
+        """Stemmed tokens of title (counted twice) and tag-stripped summary"""
+        title = article.get('title', '') or ''
+        summary = _TAG_PATTERN.sub(" ", article.get('summary', '') or '')
+        text = f"{title} {title} {summary}".lower()
+        return [stem(token) for token in _TOKEN_PATTERN.findall(text)]
@@ -0,0 +1,112 @@
+"""
+Score Cache - Disk-backed LLM engagement scores keyed by article content
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Tuple
+from config.settings import SCORE_CACHE_PATH, SCORE_CACHE_TTL_HOURS, SCORE_CACHE_MAX_ENTRIES
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class ScoreCache:
+    """SQLite score cache with a TTL and least-recently-used eviction"""
+
+    def __init__(self, db_path: str = SCORE_CACHE_PATH,
+                 ttl_hours: float = SCORE_CACHE_TTL_HOURS, max_entries: int = SCORE_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS scores (
+                   key TEXT PRIMARY KEY,
+                   score REAL NOT NULL,
+                   reason TEXT,
+                   created_at REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_last_access ON scores(last_access)")
+
+    @staticmethod
+    def article_key(article: Dict) -> str:
+        """Content hash of an article's URL, title and summary"""
+        content = "\0".join([
+            article.get('url', '') or '',
+            article.get('title', '') or '',
+            article.get('summary', '') or ''
+        ])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def lookup(self, articles: List[Dict]) -> Tuple[List[Tuple[float, Dict]], List[Dict]]:
+        """
+        Split articles into cached scores and articles still to be scored
+
+        Returns:
+            (scored, unseen) where scored holds (score, article) pairs with
+            'llm_reason' restored, in the same shape as LLM scoring output
+        """
+        now = time.time()
+        keys = [self.article_key(article) for article in articles]
+
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM scores WHERE created_at < ?", (now - self.ttl_seconds,))
+            found = {}
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for key, score, reason in self.conn.execute(
+                    f"SELECT key, score, reason FROM scores WHERE key IN ({placeholders})", batch
+                ):
+                    found[key] = (score, reason)
+            if found:
+                self.conn.executemany(
+                    "UPDATE scores SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+
+        scored, unseen = [], []
+        for key, article in zip(keys, articles):
+            if key in found:
+                score, reason = found[key]
+                article_with_reason = article.copy()
+                article_with_reason['llm_reason'] = reason
+                scored.append((score, article_with_reason))
+            else:
+                unseen.append(article)
+
+        return scored, unseen
+
+    def store(self, scored_articles: List[Tuple[float, Dict]]):
+        """Save fresh LLM scores and evict the least recently used overflow"""
+        now = time.time()
+        rows = [
+            (self.article_key(article), score, article.get('llm_reason', ''), now, now)
+            for score, article in scored_articles
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores (key, score, reason, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                """DELETE FROM scores WHERE key IN (
+                       SELECT key FROM scores ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
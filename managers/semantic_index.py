@@ -0,0 +1,199 @@
+"""
+Semantic History Index - Hashed embeddings of posted topics in a memory-mapped matrix
+"""
+
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config.settings import (
+    EXCEL_PATH, SEMANTIC_INDEX_DIM, SEMANTIC_VECTORS_PATH, SEMANTIC_META_PATH,
+    SEMANTIC_TOPIC_THRESHOLD, SEMANTIC_BODY_THRESHOLD
+)
+from managers.relevance_ranker import STEMMER_VERSION, stem
+from utils.helpers import load_json, save_json_atomic
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_STOPWORDS = frozenset(
+    "a an the and or of to in on for with by from at as is are was were be been "
+    "this that these those it its into how what why new".split()
+)
+
+KIND_TOPIC = 0
+KIND_BODY = 1
+
+def embed(texts: List[str], dim: int = SEMANTIC_INDEX_DIM) -> np.ndarray:
+    """
+    Hashing-trick embeddings, one L2-normalised float32 row per text
+
+    Features are stemmed unigrams plus ordered bigrams with signed
+    hashing. 'model trained' and 'training models' share their unigram
+    buckets but not their bigram, so word order still lowers the cosine.
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        text = _TAG_PATTERN.sub(" ", text or "").lower()
+        tokens = [stem(t) for t in _TOKEN_PATTERN.findall(text) if t not in _STOPWORDS]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            h = zlib.crc32(feature.encode('utf-8'))
+            matrix[row, h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+
+    # Sublinear term frequency, then unit length so dot product = cosine
+    np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class SemanticHistoryIndex:
+    """
+    Append-only float32 matrix of posted topic and post body embeddings
+
+    Rows live in a raw memory-mapped file; topics, row kinds and the
+    tracker mtime are kept in a small JSON sidecar.
+    """
+
+    def __init__(self, excel_path: str = EXCEL_PATH, vectors_path: str = SEMANTIC_VECTORS_PATH,
+                 meta_path: str = SEMANTIC_META_PATH, dim: int = SEMANTIC_INDEX_DIM):
+        self.excel_path = excel_path
+        self.vectors_path = vectors_path
+        self.meta_path = meta_path
+        self.dim = dim
+        self._lock = threading.Lock()
+        self.labels: List[str] = []
+        self.kinds: List[int] = []
+        self._indexed_mtime: Optional[float] = None
+        self._matrix: Optional[np.memmap] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def find_duplicates(self, articles: List[Dict]) -> np.ndarray:
+        """
+        Boolean mask of articles that repeat something already posted
+
+        Titles are compared with posted topics and title + summary with
+        post bodies, all in two matrix products against the full history.
+        """
+        if not articles or self._matrix is None or not len(self):
+            return np.zeros(len(articles), dtype=bool)
+
+        titles = embed([a.get('title', '') for a in articles], self.dim)
+        full_texts = embed([f"{a.get('title', '')} {a.get('summary', '')}" for a in articles], self.dim)
+
+        with self._lock:
+            history = self._matrix
+            kinds = np.asarray(self.kinds)
+            topic_similarity = titles @ history.T
+            body_similarity = full_texts @ history.T
+
+        topic_hits = (topic_similarity[:, kinds == KIND_TOPIC] >= SEMANTIC_TOPIC_THRESHOLD).any(axis=1)
+        body_hits = (body_similarity[:, kinds == KIND_BODY] >= SEMANTIC_BODY_THRESHOLD).any(axis=1)
+        return topic_hits | body_hits
+
+    def refresh(self):
+        """Rebuild if the Excel tracker was changed outside this index"""
+        if self._indexed_mtime != self._excel_mtime():
+            self.rebuild()
+
+    def add(self, topic: str, post_content: str = ""):
+        """Append one post's topic and body embeddings"""
+        with self._lock:
+            self._append([topic, post_content], [KIND_TOPIC, KIND_BODY])
+            self._save_meta()
+
+    def rebuild(self):
+        """Re-embed the whole Excel tracker"""
+        with self._lock:
+            self.labels, self.kinds = [], []
+            self._matrix = None
+            if os.path.exists(self.vectors_path):
+                os.remove(self.vectors_path)
+            try:
+                df = pd.read_excel(self.excel_path)
+            except FileNotFoundError:
+                df = pd.DataFrame()
+
+            texts, kinds = [], []
+            for _, row in df.iterrows():
+                topic = row.get('topic')
+                if not isinstance(topic, str):
+                    continue
+                body = row.get('post_content')
+                texts += [topic, body if isinstance(body, str) else ""]
+                kinds += [KIND_TOPIC, KIND_BODY]
+            self._append(texts, kinds)
+            self._save_meta()
+        logger.info(f"Rebuilt semantic history index: {len(self)} vectors")
+
+    def _append(self, texts: List[str], kinds: List[int]):
+        if not texts:
+            return
+        directory = os.path.dirname(self.vectors_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.vectors_path, 'ab') as f:
+            f.write(embed(texts, self.dim).tobytes())
+        self.labels += [(text or "")[:120] for text in texts]
+        self.kinds += kinds
+        self._open_matrix()
+
+    def _open_matrix(self):
+        """Map the vector file read-only with the current row count"""
+        if not self.labels:
+            self._matrix = None
+            return
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                 shape=(len(self.labels), self.dim))
+
+    def _load(self):
+        meta = load_json(self.meta_path)
+        expected_bytes = len(meta.get("labels", [])) * self.dim * 4
+        if (meta and meta.get("dim") == self.dim
+                and meta.get("stemmer") == STEMMER_VERSION
+                and meta.get("excel_mtime") == self._excel_mtime()
+                and os.path.exists(self.vectors_path)
+                and os.path.getsize(self.vectors_path) == expected_bytes):
+            self.labels = meta["labels"]
+            self.kinds = meta["kinds"]
+            self._indexed_mtime = meta["excel_mtime"]
+            self._open_matrix()
+            return
+        self.rebuild()
+
+    def _save_meta(self):
+        self._indexed_mtime = self._excel_mtime()
+        try:
+            save_json_atomic({
+                "dim": self.dim,
+                "stemmer": STEMMER_VERSION,
+                "excel_mtime": self._indexed_mtime,
+                "labels": self.labels,
+                "kinds": self.kinds
+            }, self.meta_path)
+        except Exception as e:
+            logger.error(f"Error saving semantic index metadata: {e}")
+
+    def _excel_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.excel_path)
+        except OSError:
+            return None
+
+_shared_indexes: Dict[str, SemanticHistoryIndex] = {}
+_shared_lock = threading.Lock()
+
+def get_semantic_index(excel_path: str = EXCEL_PATH) -> SemanticHistoryIndex:
+    """Return the process-wide semantic index for an Excel tracker"""
+    with _shared_lock:
+        if excel_path not in _shared_indexes:
+            _shared_indexes[excel_path] = SemanticHistoryIndex(excel_path)
+        return _shared_indexes[excel_path]
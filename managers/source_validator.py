@@ -33,11 +33,16 @@ class SourceValidator:
         """
         credible_sources = []
         
+        seen_urls = set()
         for article in articles:
-            url = article.get('url', '')
-            if self.is_credible(url):
+            # Collapsed stories carry every source that reported them
+            for member in article.get('cluster_members') or [article]:
+                url = member.get('url', '')
+                if url in seen_urls or not self.is_credible(url):
+                    continue
+                seen_urls.add(url)
                 credible_sources.append({
-                    'title': article.get('title', 'Untitled'),
+                    'title': member.get('title', 'Untitled'),
                     'url': url
                 })
         
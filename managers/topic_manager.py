@@ -2,10 +2,22 @@
 Smart Topic Manager - Dual LLM Approach (Scoring + Selection)
 """
 
-import pandas as pd
+import asyncio
+from concurrent.futures import Future
 from typing import List, Dict, Tuple
+from config.settings import (
+    SCORING_CHUNK_SIZE, SCORING_MAX_CONCURRENCY, SCORING_MISSING_RETRIES, SCORE_CACHE_ENABLED,
+    PRERANK_ENABLED, PRERANK_TOP_K, SEMANTIC_INDEX_ENABLED
+)
 from content_generator.gemini_client import GeminiClient
+from content_generator.metrics import llm_stage
+from content_generator.scheduler import get_scheduler
+from managers.posted_index import get_posted_index
+from managers.relevance_ranker import BM25Ranker
+from managers.semantic_index import get_semantic_index
+from managers.score_cache import ScoreCache
 from utils.logger import setup_logger
+from utils.text_normalizer import prompt_summary
 import json
 import re
 
@@ -17,6 +29,8 @@ class LLMScoringTopicManager:
     def __init__(self, excel_path: str):
         self.excel_path = excel_path
         self.gemini_client = GeminiClient()
+        self.score_cache = ScoreCache() if SCORE_CACHE_ENABLED else None
+        self.relevance_ranker = BM25Ranker() if PRERANK_ENABLED else None
     
     def select_best_topic(self, articles: List[Dict]) -> Tuple[str, List[Dict]]:
         """Main method: LLM scoring → Top 10 → LLM final selection"""
@@ -30,9 +44,25 @@ class LLMScoringTopicManager:
         if not available_articles:
             return "", []
         
-        # Step 2: LLM scores ALL articles in one call
-        scored_articles = self._llm_score_all_articles(available_articles)
-        logger.info(f"LLM scored {len(scored_articles)} articles")
+        # Cheap local BM25 pass so only plausible topics reach the LLM
+        if self.relevance_ranker:
+            available_articles = self.relevance_ranker.top_k(available_articles, PRERANK_TOP_K)
+        
+        # Step 2: Reuse cached scores; the LLM only scores unseen articles
+        if self.score_cache:
+            cached_scores, unseen_articles = self.score_cache.lookup(available_articles)
+            logger.info(f"Score cache: {len(cached_scores)} hits, {len(unseen_articles)} articles to score")
+        else:
+            cached_scores, unseen_articles = [], available_articles
+        
+        with llm_stage("scoring"):
+            fresh_scores = self._llm_score_all_articles(unseen_articles) if unseen_articles else []
+        logger.info(f"LLM scored {len(fresh_scores)} articles")
+        
+        if self.score_cache and fresh_scores:
+            self.score_cache.store(fresh_scores)
+        
+        scored_articles = sorted(cached_scores + fresh_scores, key=lambda x: x[0], reverse=True)
         
         if not scored_articles:
             return "", []
@@ -42,18 +72,18 @@ class LLMScoringTopicManager:
         logger.info(f"Selected top {len(top_candidates)} candidates for final LLM selection")
         
         # Step 4: LLM selects best from top 10
-        selected_topic, relevant_articles = self._llm_final_selection(top_candidates)
+        with llm_stage("selection"):
+            selected_topic, relevant_articles = self._llm_final_selection(top_candidates)
         
         return selected_topic, relevant_articles
     
     def _filter_posted_topics(self, articles: List[Dict]) -> List[Dict]:
         """Filter out previously posted topics"""
-        try:
-            df = pd.read_excel(self.excel_path)
-            posted_topics = df['topic'].tolist() if not df.empty else []
-            logger.info(f"Found {len(posted_topics)} previously posted topics")
-        except FileNotFoundError:
-            posted_topics = []
+        posted_index = get_posted_index(self.excel_path)
+        posted_index.refresh()
+        if len(posted_index):
+            logger.info(f"Found {len(posted_index)} previously posted topics")
+        else:
             logger.info("No previous posts found")
         
         available_articles = []
@@ -62,49 +92,119 @@ class LLMScoringTopicManager:
             if not title:
                 continue
             
-            # Check for similarity with posted topics
-            is_duplicate = any(
-                self._calculate_similarity(title, posted_title) > 0.7 
-                for posted_title in posted_topics
-            )
+            # Check for similarity with posted topics (only those sharing a word)
+            is_duplicate = posted_index.is_duplicate(title, threshold=0.7)
             
             if not is_duplicate:
                 available_articles.append(article)
         
+        # Catch paraphrased repeats with one vectorized pass over all history
+        if SEMANTIC_INDEX_ENABLED and available_articles:
+            semantic_index = get_semantic_index(self.excel_path)
+            semantic_index.refresh()
+            duplicates = semantic_index.find_duplicates(available_articles)
+            if duplicates.any():
+                logger.info(f"Semantic index flagged {int(duplicates.sum())} paraphrased repeats")
+                available_articles = [a for a, dup in zip(available_articles, duplicates) if not dup]
+        
         return available_articles
     
-    def _calculate_similarity(self, title1: str, title2: str) -> float:
-        """Calculate similarity between two titles"""
-        words1 = set(title1.lower().split())
-        words2 = set(title2.lower().split())
+    def _llm_score_all_articles(self, articles: List[Dict]) -> List[Tuple[float, Dict]]:
+        """Score articles in fixed-size chunks, running chunks concurrently"""
         
-        if not words1 or not words2:
-            return 0.0
+        try:
+            chunks = [
+                articles[i:i + SCORING_CHUNK_SIZE]
+                for i in range(0, len(articles), SCORING_CHUNK_SIZE)
+            ]
+            if not chunks:
+                return []
+            
+            logger.info(f"Requesting LLM scores for {len(articles)} articles in {len(chunks)} chunks...")
+            chunk_results = [future.result() for future in self._submit_chunks(chunks)]
+            
+            # Merge chunk results into one ranking
+            scored_articles = [pair for chunk_scores in chunk_results for pair in chunk_scores]
+            scored_articles.sort(key=lambda x: x[0], reverse=True)
+            
+            if not scored_articles:
+                logger.error("No response from LLM scoring")
+                return []
+            
+            # Log top scored articles
+            logger.info("🏆 Top LLM-scored articles:")
+            for i, (score, article) in enumerate(scored_articles[:5], 1):
+                title = article.get('title', 'Untitled')[:50]
+                logger.info(f"  {i}. {title}... (LLM Score: {score}/10)")
+            
+            return scored_articles
+            
+        except Exception as e:
+            logger.error(f"Error in LLM scoring: {e}")
+            return []
+    
+    def _submit_chunks(self, chunks: List[List[Dict]]) -> List[Future]:
+        """Score all chunks concurrently on the shared scheduler, at most SCORING_MAX_CONCURRENCY at a time"""
+        # Only ever used on the scheduler's loop
+        limit = asyncio.Semaphore(SCORING_MAX_CONCURRENCY)
         
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        async def score(chunk: List[Dict]) -> List[Tuple[float, Dict]]:
+            async with limit:
+                return await self._score_chunk(chunk)
         
-        return intersection / union if union > 0 else 0.0
+        # Unguarded: the requests inside each chunk take their own scheduler slots
+        scheduler = get_scheduler()
+        return [scheduler.submit(lambda chunk=chunk: score(chunk), guarded=False) for chunk in chunks]
     
-    def _llm_score_all_articles(self, articles: List[Dict]) -> List[Tuple[float, Dict]]:
-        """Send ALL articles to LLM for scoring in one API call"""
+    async def _score_chunk(self, articles: List[Dict]) -> List[Tuple[float, Dict]]:
+        """Score one chunk, re-requesting only the articles the LLM skipped"""
         
-        try:
-            # Format all articles for LLM scoring
-            article_list = []
-            for i, article in enumerate(articles, 1):
-                title = article.get('title', 'Untitled')
-                summary = article.get('summary', '')[:100]  # Truncate to save tokens
-                source = article.get('source', 'Unknown')
-                
-                article_list.append(f"{i}. **{title}**")
-                if summary:
-                    article_list.append(f"   Summary: {summary}...")
-                article_list.append(f"   Source: {source}")
-                article_list.append("")  # Empty line for readability
+        scores = {}
+        pending = list(range(len(articles)))
+        
+        for attempt in range(SCORING_MISSING_RETRIES + 1):
+            subset = [articles[i] for i in pending]
+            response = await self.gemini_client.agenerate_content(self._build_scoring_prompt(subset))
             
-            # Create comprehensive scoring prompt
-            scoring_prompt = f"""You are a LinkedIn content strategist and AI expert. Score each of these {len(articles)} AI articles for LinkedIn engagement potential.
+            # Map positions in this request back to the chunk
+            for position, parsed in self._parse_llm_score_lines(response or "", len(subset)).items():
+                scores[pending[position]] = parsed
+            
+            pending = [i for i in range(len(articles)) if i not in scores]
+            if not pending:
+                break
+            if attempt < SCORING_MISSING_RETRIES:
+                logger.warning(f"LLM skipped {len(pending)} of {len(articles)} articles, re-requesting those only")
+        
+        if pending:
+            logger.warning(f"Dropping {len(pending)} articles the LLM never scored")
+        
+        scored_articles = []
+        for index, (score, reason) in scores.items():
+            article_with_reason = articles[index].copy()
+            article_with_reason['llm_reason'] = reason
+            scored_articles.append((score, article_with_reason))
+        
+        return scored_articles
+    
+    def _build_scoring_prompt(self, articles: List[Dict]) -> str:
+        """Build the engagement scoring prompt for a list of articles"""
+        
+        # Format all articles for LLM scoring
+        article_list = []
+        for i, article in enumerate(articles, 1):
+            title = article.get('title', 'Untitled')
+            summary = prompt_summary(article, 'summary_short')
+            source = article.get('source', 'Unknown')
+            
+            article_list.append(f"{i}. **{title}**")
+            if summary:
+                article_list.append(f"   Summary: {summary}")
+            article_list.append(f"   Source: {source}")
+            article_list.append("")  # Empty line for readability
+        
+        # Create comprehensive scoring prompt
+        scoring_prompt = f"""You are a LinkedIn content strategist and AI expert. Score each of these {len(articles)} AI articles for LinkedIn engagement potential.
 
 ARTICLES TO SCORE:
 {chr(10).join(article_list)}
@@ -135,30 +235,8 @@ Example:
 3: 9.0 - Major company announcement, high discussion value
 
 Score each article (1-{len(articles)}):"""
-
-            # Get LLM scores
-            logger.info(f"Requesting LLM scores for {len(articles)} articles...")
-            response = self.gemini_client.generate_content(scoring_prompt)
-            
-            if not response:
-                logger.error("No response from LLM scoring")
-                return []
-            
-            # Parse scores from LLM response
-            scored_articles = self._parse_llm_scores(response, articles)
-            
-            # Log top scored articles
-            if scored_articles:
-                logger.info("🏆 Top LLM-scored articles:")
-                for i, (score, article) in enumerate(scored_articles[:5], 1):
-                    title = article.get('title', 'Untitled')[:50]
-                    logger.info(f"  {i}. {title}... (LLM Score: {score}/10)")
-            
-            return scored_articles
-            
-        except Exception as e:
-            logger.error(f"Error in LLM scoring: {e}")
-            return []
+        
+        return scoring_prompt
     
     def _parse_llm_scores(self, response: str, articles: List[Dict]) -> List[Tuple[float, Dict]]:
         """Parse LLM response to extract scores for each article"""
@@ -166,31 +244,12 @@ Score each article (1-{len(articles)}):"""
         scored_articles = []
         
         try:
-            lines = response.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+            for index, (score, reason) in self._parse_llm_score_lines(response, len(articles)).items():
+                # Add reason to article for logging
+                article_with_reason = articles[index].copy()
+                article_with_reason['llm_reason'] = reason
                 
-                # Look for pattern: "1: 8.5 - reason" or "1. 8.5 - reason"
-                match = re.match(r'^(\d+)[\:\.]?\s*(\d+(?:\.\d+)?)\s*[-–—]\s*(.+)$', line)
-                
-                if match:
-                    article_num = int(match.group(1))
-                    score = float(match.group(2))
-                    reason = match.group(3)
-                    
-                    # Validate article number and score
-                    if 1 <= article_num <= len(articles) and 0 <= score <= 10:
-                        article_index = article_num - 1
-                        article = articles[article_index]
-                        
-                        # Add reason to article for logging
-                        article_with_reason = article.copy()
-                        article_with_reason['llm_reason'] = reason
-                        
-                        scored_articles.append((score, article_with_reason))
+                scored_articles.append((score, article_with_reason))
             
             # Sort by score (highest first)
             scored_articles.sort(key=lambda x: x[0], reverse=True)
@@ -203,6 +262,30 @@ Score each article (1-{len(articles)}):"""
             logger.error(f"Error parsing LLM scores: {e}")
             return []
     
+    def _parse_llm_score_lines(self, response: str, num_articles: int) -> Dict[int, Tuple[float, str]]:
+        """Parse "N: score - reason" lines into {0-based index: (score, reason)}"""
+        
+        scores = {}
+        
+        for line in response.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Look for pattern: "1: 8.5 - reason" or "1. 8.5 - reason"
+            match = re.match(r'^(\d+)[\:\.]?\s*(\d+(?:\.\d+)?)\s*[-–—]\s*(.+)$', line)
+            
+            if match:
+                article_num = int(match.group(1))
+                score = float(match.group(2))
+                reason = match.group(3)
+                
+                # Validate article number and score; first answer wins
+                if 1 <= article_num <= num_articles and 0 <= score <= 10:
+                    scores.setdefault(article_num - 1, (score, reason))
+        
+        return scores
+    
     def _select_top_candidates(self, scored_articles: List[Tuple[float, Dict]], top_n: int = 10) -> List[Dict]:
         """Select top N articles based on LLM scores"""
         
@@ -232,7 +315,7 @@ Score each article (1-{len(articles)}):"""
             candidate_summaries = []
             for i, article in enumerate(candidates, 1):
                 title = article.get('title', 'Untitled')
-                summary = article.get('summary', '')[:150]
+                summary = prompt_summary(article, 'summary_medium')
                 source = article.get('source', 'Unknown')
                 score = article.get('llm_score', 0)
                 reason = article.get('llm_reason', 'No reason')
@@ -241,7 +324,7 @@ Score each article (1-{len(articles)}):"""
                     f"{i}. **{title}** (LLM Score: {score}/10)\n"
                     f"   Source: {source}\n"
                     f"   Why it scored high: {reason}\n"
-                    f"   Summary: {summary}...\n"
+                    f"   Summary: {summary}\n"
                 )
             
             # Create focused final selection prompt
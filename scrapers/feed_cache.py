@@ -0,0 +1,59 @@
+"""
+Feed cache - Persists HTTP validators and parsed entries per feed
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from config.settings import FEED_CACHE_PATH
+from utils.helpers import load_json, save_json_atomic
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class FeedCache:
+    """On-disk ETag / Last-Modified cache shared by all RSS scrapers"""
+
+    def __init__(self, cache_path: str = FEED_CACHE_PATH):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = load_json(cache_path).get("feeds", {})
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached record for a feed URL, if any"""
+        with self._lock:
+            return self._entries.get(url)
+
+    def validators(self, url: str) -> Dict[str, Optional[str]]:
+        """Return the stored ETag and Last-Modified values for a feed"""
+        record = self.get(url) or {}
+        return {"etag": record.get("etag"), "modified": record.get("modified")}
+
+    def store(self, url: str, articles: List[Dict], etag: Optional[str] = None, modified: Optional[str] = None):
+        """Save validators and parsed articles after a full fetch"""
+        with self._lock:
+            self._entries[url] = {
+                "etag": etag,
+                "modified": modified,
+                "articles": articles,
+                "fetched_at": datetime.now().isoformat()
+            }
+            self._save()
+
+    def _save(self):
+        """Write the cache atomically so concurrent runs never see half a file"""
+        try:
+            save_json_atomic({"feeds": self._entries}, self.cache_path)
+        except Exception as e:
+            logger.error(f"Error saving feed cache: {e}")
+
+_shared_cache: Optional[FeedCache] = None
+_shared_lock = threading.Lock()
+
+def get_feed_cache() -> FeedCache:
+    """Return the process-wide feed cache"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FeedCache()
+        return _shared_cache
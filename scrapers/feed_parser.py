@@ -0,0 +1,104 @@
+"""
+Streaming feed parser - Incremental RSS/Atom parsing with early termination
+"""
+
+from typing import Dict, Iterator, Optional
+from lxml import etree
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+ENTRY_TAGS = {"item", "entry"}
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+DATE_TAGS = ("pubDate", "published", "date", "updated")
+
+class RecordingReader:
+    """File-like wrapper that keeps a copy of every byte read
+
+    Lets the caller fall back to a full parse of the same document if
+    the streaming parse fails part way through.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.buffer.extend(chunk)
+        return chunk
+
+    def read_all(self) -> bytes:
+        """Drain the stream and return the whole document"""
+        self.buffer.extend(self.stream.read())
+        return bytes(self.buffer)
+
+def iter_feed_entries(stream, limit: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Yield feed entries one at a time from an RSS or Atom byte stream
+
+    Reading stops as soon as `limit` entries have been produced, and each
+    entry's element tree is freed once it has been converted.
+
+    Args:
+        stream: File-like object returning bytes
+        limit: Maximum number of entries to yield
+
+    Yields:
+        Dicts with feedparser-style keys: title, link, summary, published
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    produced = 0
+    context = etree.iterparse(stream, events=("end",), recover=True, resolve_entities=False, no_network=True)
+
+    for _, element in context:
+        if not isinstance(element.tag, str) or etree.QName(element).localname not in ENTRY_TAGS:
+            continue
+
+        entry = _element_to_entry(element)
+
+        # Free this entry and every sibling already processed
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None and parent is not None:
+            del parent[0]
+
+        yield entry
+        produced += 1
+        if limit is not None and produced >= limit:
+            break
+
+    del context
+
+def _element_to_entry(element) -> Dict:
+    """Convert an <item> or <entry> element to a dict"""
+    children = {}
+    link = ""
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        name = etree.QName(child).localname
+        if name == "link":
+            # Atom links carry the URL in href; prefer rel="alternate"
+            href = child.get("href")
+            if href and (child.get("rel", "alternate") == "alternate" or not link):
+                link = href
+            elif not href and child.text and not link:
+                link = child.text.strip()
+            continue
+        children.setdefault(name, child)
+
+    return {
+        "title": _text(children.get("title")),
+        "link": link,
+        "summary": next((_text(children[tag]) for tag in SUMMARY_TAGS if tag in children), ""),
+        "published": next((_text(children[tag]) for tag in DATE_TAGS if tag in children), None)
+    }
+
+def _text(element) -> str:
+    """All text content of an element, including nested XHTML"""
+    if element is None:
+        return ""
+    return "".join(element.itertext()).strip()
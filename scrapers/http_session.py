@@ -0,0 +1,107 @@
+"""
+Shared HTTP session - Connection pooling and per-host rate limiting for all scrapers
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import (
+    HOST_RATE_PER_SECOND, HOST_BURST, HTTP_POOL_SIZE,
+    RATE_LIMIT_COOLDOWN, SCRAPE_TIMEOUT
+)
+from utils.helpers import extract_domain
+from utils.logger import setup_logger
+from utils.rate_limit import TokenBucket
+
+logger = setup_logger()
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+class HostCooldownError(Exception):
+    """Raised when a host is still inside its Retry-After window"""
+
+class HttpSession:
+    """Pooled requests session with a token bucket and cooldown per host"""
+
+    def __init__(self, rate: float = HOST_RATE_PER_SECOND, burst: float = HOST_BURST,
+                 pool_size: int = HTTP_POOL_SIZE):
+        self.rate = rate
+        self.burst = burst
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._cooldowns: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[Dict] = None, timeout: int = SCRAPE_TIMEOUT, **kwargs) -> requests.Response:
+        """
+        GET a URL through the shared pool
+
+        Waits only for this host's token bucket. A host that answered 429
+        or 503 is put on cooldown for its Retry-After period and further
+        requests to it fail fast with HostCooldownError instead of sleeping.
+        """
+        host = extract_domain(url)
+        remaining = self.cooldown_remaining(host)
+        if remaining > 0:
+            raise HostCooldownError(f"{host} is rate limited for another {remaining:.0f}s")
+
+        self._bucket(host).acquire()
+
+        response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+        if response.status_code in (429, 503):
+            delay = self._retry_after(response)
+            with self._lock:
+                self._cooldowns[host] = time.monotonic() + delay
+            logger.warning(f"{host}: rate limited ({response.status_code}), backing off {delay:.0f}s")
+
+        return response
+
+    def cooldown_remaining(self, host: str) -> float:
+        """Seconds left before a rate-limited host may be contacted again"""
+        with self._lock:
+            until = self._cooldowns.get(host, 0.0)
+        return max(0.0, until - time.monotonic())
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Return (creating if needed) the token bucket for a host"""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _retry_after(self, response: requests.Response) -> float:
+        """Parse Retry-After as seconds or an HTTP date"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return RATE_LIMIT_COOLDOWN
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return RATE_LIMIT_COOLDOWN
+
+_shared_session: Optional[HttpSession] = None
+_shared_lock = threading.Lock()
+
+def get_http_session() -> HttpSession:
+    """Return the process-wide scraper session"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = HttpSession()
+        return _shared_session
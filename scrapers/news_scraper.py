@@ -3,21 +3,37 @@ Improved news scraper with better headers, delays, and error handling
 """
 
 import requests
-import time
-import random
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import List, Dict, Optional
+from config.settings import MAX_ARTICLES_PER_SOURCE, SCRAPE_TIMEOUT
 from scrapers.base_scraper import BaseScraper
+from scrapers.http_session import HostCooldownError, get_http_session
+from scrapers.selector_memo import get_selector_memo
 from utils.logger import setup_logger
 from utils.helpers import clean_text
+from utils.text_normalizer import normalize_article
 
 logger = setup_logger()
 
+# Multiple strategies to find articles, tried in order
+ARTICLE_SELECTORS = [
+    'article',
+    'div.post',
+    'div.article',
+    'div.entry',
+    'div[class*="post"]',
+    'div[class*="article"]',
+    'li.post',
+    'div.wp-block-post'
+]
+
 class NewsScraper(BaseScraper):
     """Scraper for news websites with anti-blocking measures"""
     
     def __init__(self, source_name: str, source_url: str):
         super().__init__(source_name, source_url)
+        self.http = get_http_session()
+        self.selector_memo = get_selector_memo()
         
         # Realistic browser headers to avoid detection
         self.headers = {
@@ -25,7 +41,6 @@ class NewsScraper(BaseScraper):
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
             'Sec-Fetch-Mode': 'navigate',
@@ -38,31 +53,38 @@ class NewsScraper(BaseScraper):
         try:
             logger.info(f"Scraping {self.source_name}...")
             
-            # Add random delay to appear more human-like
-            time.sleep(random.uniform(2, 5))
-            
-            # Make request with headers
-            response = requests.get(
+            # Pooled request; the session paces requests per host
+            response = self.http.get(
                 self.source_url, 
                 headers=self.headers,
-                timeout=30,
+                timeout=SCRAPE_TIMEOUT,
                 allow_redirects=True
             )
             
-            # Check response status
+            # Check response status (the session has put the host on cooldown)
             if response.status_code == 429:
-                logger.warning(f"{self.source_name}: Rate limited (429). Waiting...")
-                time.sleep(60)  # Wait 1 minute
+                logger.warning(f"{self.source_name}: Rate limited (429), skipping this run")
                 return []
             
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            articles = self.parse_articles(soup)
+            # Fast path: parse only the subtrees the remembered selector needs
+            articles = []
+            remembered = self.selector_memo.get(self.source_name)
+            if remembered:
+                soup = self._make_soup(response.content, [remembered])
+                articles = self.parse_articles(soup, [remembered])
+            
+            if not articles:
+                soup = self._make_soup(response.content, ARTICLE_SELECTORS)
+                articles = self.parse_articles(soup)
             
             logger.info(f"Found {len(articles)} articles from {self.source_name}")
             return articles
             
+        except HostCooldownError as e:
+            logger.warning(f"Skipping {self.source_name}: {e}")
+            return []
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error scraping {self.source_name}: {e}")
             return []
@@ -95,38 +117,31 @@ class NewsScraper(BaseScraper):
                 from urllib.parse import urljoin
                 article_url = urljoin(self.source_url, article_url)
             
-            return {
+            return normalize_article({
                 'title': clean_text(title.get_text()) if title else "",
                 'url': article_url,
-                'summary': clean_text(summary.get_text()[:300]) if summary else "",
+                'summary': clean_text(summary.get_text()) if summary else "",
                 'source': self.source_name,
                 'date': None
-            }
+            })
         except Exception as e:
             logger.error(f"Error parsing article: {e}")
             return {}
     
-    def parse_articles(self, soup) -> List[Dict]:
+    def parse_articles(self, soup, selectors: Optional[List[str]] = None) -> List[Dict]:
         """Parse all articles from page with multiple selector strategies"""
         articles = []
         
-        # Multiple strategies to find articles
-        selectors = [
-            'article',
-            'div.post',
-            'div.article',
-            'div.entry',
-            'div[class*="post"]',
-            'div[class*="article"]',
-            'li.post',
-            'div.wp-block-post'
-        ]
+        if selectors is None:
+            selectors = self._ordered_selectors()
         
         article_elements = []
+        winning_selector = None
         for selector in selectors:
             elements = soup.select(selector)
             if elements:
                 article_elements = elements
+                winning_selector = selector
                 logger.info(f"Found articles using selector: {selector}")
                 break
         
@@ -135,9 +150,31 @@ class NewsScraper(BaseScraper):
             return []
         
         # Parse each article
-        for element in article_elements[:10]:
+        for element in article_elements[:MAX_ARTICLES_PER_SOURCE]:
             article = self.parse_article(element)
             if article and article.get('title') and article.get('url'):
                 articles.append(article)
         
+        if articles:
+            self.selector_memo.remember(self.source_name, winning_selector)
+        
         return articles
+    
+    def _ordered_selectors(self) -> List[str]:
+        """Selector strategies with last run's winner tried first"""
+        remembered = self.selector_memo.get(self.source_name)
+        if remembered in ARTICLE_SELECTORS:
+            return [remembered] + [s for s in ARTICLE_SELECTORS if s != remembered]
+        return list(ARTICLE_SELECTORS)
+    
+    def _make_soup(self, content: bytes, selectors: List[str]) -> BeautifulSoup:
+        """Build an lxml soup containing only the tags the selectors can match"""
+        tag_names = {self._selector_tag(selector) for selector in selectors}
+        return BeautifulSoup(content, 'lxml', parse_only=SoupStrainer(list(tag_names)))
+    
+    @staticmethod
+    def _selector_tag(selector: str) -> str:
+        """Leading tag name of a simple CSS selector, e.g. 'div' for 'div[class*=post]'"""
+        for separator in ('.', '[', '#', ':', ' '):
+            selector = selector.split(separator, 1)[0]
+        return selector or 'div'
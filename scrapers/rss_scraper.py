@@ -3,55 +3,116 @@ RSS Feed scraper - More reliable than HTML scraping
 """
 
 import feedparser
-import time
-import random
-from typing import List, Dict
+from typing import List, Dict, Optional
+from config.settings import FEED_CACHE_ENABLED, FEED_PARSER_MODE, MAX_ARTICLES_PER_SOURCE, SCRAPE_TIMEOUT
 from scrapers.base_scraper import BaseScraper
+from scrapers.feed_cache import FeedCache, get_feed_cache
+from scrapers.feed_parser import RecordingReader, iter_feed_entries
+from scrapers.http_session import HostCooldownError, get_http_session
 from utils.logger import setup_logger
+from utils.text_normalizer import normalize_article
 
 logger = setup_logger()
 
 class RSSFeedScraper(BaseScraper):
     """Scraper for RSS feeds - more reliable for news sites"""
     
+    def __init__(self, source_name: str, source_url: str, cache: Optional[FeedCache] = None):
+        super().__init__(source_name, source_url)
+        if cache is None and FEED_CACHE_ENABLED:
+            cache = get_feed_cache()
+        self.cache = cache
+        self.http = get_http_session()
+    
     def scrape(self) -> List[Dict]:
         """Scrape articles from RSS feed"""
         try:
             logger.info(f"Scraping RSS feed: {self.source_name}...")
             
-            # Add delay
-            time.sleep(random.uniform(1, 3))
+            # Conditional GET: send the validators from the last full fetch
+            headers = {'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8'}
+            validators = self.cache.validators(self.source_url) if self.cache else {}
+            if validators.get("etag"):
+                headers['If-None-Match'] = validators["etag"]
+            if validators.get("modified"):
+                headers['If-Modified-Since'] = validators["modified"]
+            
+            response = self.http.get(
+                self.source_url,
+                headers=headers,
+                timeout=SCRAPE_TIMEOUT,
+                stream=FEED_PARSER_MODE == "stream"
+            )
             
-            # Parse RSS feed
-            feed = feedparser.parse(self.source_url)
+            try:
+                if response.status_code == 304 and self.cache:
+                    cached = self.cache.get(self.source_url) or {}
+                    articles = cached.get("articles", [])
+                    logger.info(f"{self.source_name} not modified (304), using {len(articles)} cached articles")
+                    return articles
+                
+                response.raise_for_status()
+                
+                # Parse RSS feed
+                entries = self._parse_entries(response)
+            finally:
+                response.close()
             
-            if not feed.entries:
+            if not entries:
                 logger.warning(f"No entries found in RSS feed: {self.source_name}")
                 return []
             
             articles = []
-            for entry in feed.entries[:10]:
+            for entry in entries:
                 article = self.parse_article(entry)
                 if article:
                     articles.append(article)
             
+            if self.cache:
+                self.cache.store(
+                    self.source_url,
+                    articles,
+                    etag=response.headers.get('ETag'),
+                    modified=response.headers.get('Last-Modified')
+                )
+            
             logger.info(f"Found {len(articles)} articles from {self.source_name}")
             return articles
             
+        except HostCooldownError as e:
+            logger.warning(f"Skipping {self.source_name}: {e}")
+            return []
         except Exception as e:
             logger.error(f"Error scraping RSS feed {self.source_name}: {e}")
             return []
     
+    def _parse_entries(self, response) -> List[Dict]:
+        """Parse up to MAX_ARTICLES_PER_SOURCE entries from a feed response"""
+        if FEED_PARSER_MODE != "stream":
+            return feedparser.parse(response.content).entries[:MAX_ARTICLES_PER_SOURCE]
+        
+        # Stream straight off the socket and stop once we have enough entries
+        response.raw.decode_content = True
+        reader = RecordingReader(response.raw)
+        try:
+            entries = list(iter_feed_entries(reader, limit=MAX_ARTICLES_PER_SOURCE))
+            if entries:
+                return entries
+        except Exception as e:
+            logger.warning(f"Streaming parse failed for {self.source_name}, falling back to feedparser: {e}")
+        
+        return feedparser.parse(reader.read_all()).entries[:MAX_ARTICLES_PER_SOURCE]
+    
     def parse_article(self, entry) -> Dict:
         """Parse single RSS entry"""
         try:
-            return {
-                'title': entry.get('title', '').strip(),
+            return normalize_article({
+                'title': entry.get('title', ''),
                 'url': entry.get('link', ''),
-                'summary': entry.get('summary', '')[:300],
+                'summary': entry.get('summary', ''),
                 'source': self.source_name,
                 'date': entry.get('published', None)
-            }
+            })
         except Exception as e:
             logger.error(f"Error parsing RSS entry: {e}")
             return {}
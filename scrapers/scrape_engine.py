@@ -0,0 +1,80 @@
+"""
+Scrape engine - Fetches all configured sources concurrently
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
+from config.settings import SCRAPE_MAX_WORKERS
+from scrapers.base_scraper import BaseScraper
+from scrapers.news_scraper import NewsScraper
+from scrapers.rss_scraper import RSSFeedScraper
+from utils.helpers import extract_domain
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class ScrapeEngine:
+    """Runs scrapers in a thread pool, one worker per host at a time"""
+
+    def __init__(self, sources: List[Dict], max_workers: int = SCRAPE_MAX_WORKERS):
+        self.sources = sources
+        self.max_workers = max(1, max_workers)
+
+    def run(self) -> List[Dict]:
+        """
+        Scrape every source and merge the results
+
+        Sources on the same host are scraped one after another so each
+        host still sees the scraper's politeness delay; different hosts
+        run in parallel.
+
+        Returns:
+            All articles, ordered by source position in the config
+        """
+        host_groups = self._group_by_host()
+        results: Dict[int, List[Dict]] = {}
+
+        workers = min(self.max_workers, len(host_groups)) or 1
+        logger.info(f"Scraping {len(self.sources)} sources across {len(host_groups)} hosts ({workers} workers)...")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as executor:
+            futures = {
+                executor.submit(self._scrape_host, group): host
+                for host, group in host_groups.items()
+            }
+            for future in as_completed(futures):
+                host = futures[future]
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    logger.error(f"Error scraping host {host}: {e}")
+
+        # Merge in config order so output is stable across runs
+        all_articles = []
+        for index in range(len(self.sources)):
+            all_articles.extend(results.get(index, []))
+
+        return all_articles
+
+    def _group_by_host(self) -> "OrderedDict[str, List[Tuple[int, Dict]]]":
+        """Group sources by host, keeping their config index"""
+        groups: "OrderedDict[str, List[Tuple[int, Dict]]]" = OrderedDict()
+        for index, source in enumerate(self.sources):
+            host = extract_domain(source.get('url', '')) or source.get('name', str(index))
+            groups.setdefault(host, []).append((index, source))
+        return groups
+
+    def _scrape_host(self, group: List[Tuple[int, Dict]]) -> Dict[int, List[Dict]]:
+        """Scrape all sources of one host sequentially"""
+        host_results = {}
+        for index, source in group:
+            scraper = build_scraper(source)
+            host_results[index] = scraper.scrape()
+        return host_results
+
+def build_scraper(source: Dict) -> BaseScraper:
+    """Create the right scraper for a configured source"""
+    if source.get('type', 'rss') == 'rss':
+        return RSSFeedScraper(source['name'], source['url'])
+    return NewsScraper(source['name'], source['url'])
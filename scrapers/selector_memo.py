@@ -0,0 +1,46 @@
+"""
+Selector memo - Remembers which CSS selector matched each HTML source
+"""
+
+import threading
+from typing import Dict, Optional
+from config.settings import SELECTOR_MEMO_PATH
+from utils.helpers import load_json, save_json_atomic
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class SelectorMemo:
+    """Persisted source name -> winning article selector"""
+
+    def __init__(self, memo_path: str = SELECTOR_MEMO_PATH):
+        self.memo_path = memo_path
+        self._lock = threading.Lock()
+        self._selectors: Dict[str, str] = load_json(memo_path).get("selectors", {})
+
+    def get(self, source_name: str) -> Optional[str]:
+        """Selector that matched last time for this source"""
+        with self._lock:
+            return self._selectors.get(source_name)
+
+    def remember(self, source_name: str, selector: str):
+        """Record the winning selector, writing only when it changed"""
+        with self._lock:
+            if self._selectors.get(source_name) == selector:
+                return
+            self._selectors[source_name] = selector
+            try:
+                save_json_atomic({"selectors": self._selectors}, self.memo_path)
+            except Exception as e:
+                logger.error(f"Error saving selector memo: {e}")
+
+_shared_memo: Optional[SelectorMemo] = None
+_shared_lock = threading.Lock()
+
+def get_selector_memo() -> SelectorMemo:
+    """Return the process-wide selector memo"""
+    global _shared_memo
+    with _shared_lock:
+        if _shared_memo is None:
+            _shared_memo = SelectorMemo()
+        return _shared_memo
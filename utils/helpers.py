@@ -3,6 +3,7 @@ Helper utility functions
 """
 
 import json
+import os
 from datetime import datetime
 from typing import Dict
 from urllib.parse import urlparse
@@ -12,6 +13,16 @@ def save_json(data: Dict, filepath: str):
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
+def save_json_atomic(data: Dict, filepath: str):
+    """Save data to JSON via a temp file so readers never see a partial write"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, filepath)
+
 def load_json(filepath: str) -> Dict:
     """Load data from JSON file"""
     try:
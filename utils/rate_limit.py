@@ -0,0 +1,46 @@
+"""
+Token bucket rate limiter
+"""
+
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket that refills at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket without blocking
+
+        The tokens are always granted; when the bucket runs dry it goes
+        into debt and the caller is told how long to wait before acting.
+
+        Returns:
+            Seconds the caller should wait before using the tokens
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Take tokens, sleeping until they are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,79 @@
+"""
+Text normalizer - Clean article text once at ingest and cut summaries to token budgets
+"""
+
+import html
+import re
+from typing import Dict
+from config.settings import SUMMARY_MAX_TOKENS, SUMMARY_TOKEN_BUDGETS
+
+CHARS_PER_TOKEN = 4  # Same rough ratio the LLM rate limiter uses
+
+_BLOCK_PATTERN = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# Sentence end plus any closing quotes/brackets; the whitespace after it is not part of the match
+_SENTENCE_END_PATTERN = re.compile(r"[.!?][\"')\]]*(?=\s+[A-Z0-9\"'(\[])")
+_BOILERPLATE_PATTERN = re.compile(
+    r"\s*(The post .{0,200}? appeared first on .{0,100}?\.?|Continue reading\s*\.*|Read more\s*\.*|\[(…|\.\.\.)\])\s*$",
+    re.IGNORECASE
+)
+
+def strip_html(text: str) -> str:
+    """Plain text from an HTML fragment: tags removed, entities decoded, whitespace collapsed"""
+    if not text:
+        return ""
+    text = _BLOCK_PATTERN.sub(" ", text)
+    text = _COMMENT_PATTERN.sub(" ", text)
+    text = _TAG_PATTERN.sub(" ", text)
+    # Decode after tag removal so escaped markup ("&lt;b&gt;") stays literal text
+    text = html.unescape(text).replace(" ", " ")
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    return _BOILERPLATE_PATTERN.sub("", text).strip()
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Longest run of whole sentences within a token budget
+
+    The result is always a prefix of `text`, closing quotes and brackets
+    included. If even the first sentence is too long it is cut at a
+    word boundary and ends with an ellipsis.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    kept_end = 0
+    for match in _SENTENCE_END_PATTERN.finditer(text):
+        if match.end() > max_chars:
+            break
+        kept_end = match.end()
+    if kept_end:
+        return text[:kept_end]
+
+    cut = text[:max_chars - 1]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,;:-") + "…"
+
+def normalize_article(article: Dict) -> Dict:
+    """
+    Clean title and summary in place and add per-prompt summary variants
+
+    Adds one key per SUMMARY_TOKEN_BUDGETS entry (summary_short,
+    summary_medium, summary_long) so prompts never cut text themselves.
+    """
+    article['title'] = strip_html(article.get('title') or "")
+    summary = truncate_to_tokens(strip_html(article.get('summary') or ""), SUMMARY_MAX_TOKENS)
+    article['summary'] = summary
+    for key, budget in SUMMARY_TOKEN_BUDGETS.items():
+        article[key] = truncate_to_tokens(summary, budget)
+    return article
+
+def prompt_summary(article: Dict, key: str) -> str:
+    """Summary variant for a prompt, derived on the fly for articles stored before normalization"""
+    value = article.get(key)
+    if value is not None:
+        return value
+    return truncate_to_tokens(strip_html(article.get('summary') or ""), SUMMARY_TOKEN_BUDGETS[key])